@@ -1,25 +1,36 @@
 import asyncio
 import time
 import logging
+import re
 import hashlib
 import json
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from pydantic import BaseModel, Field
-from src.openrouter import OpenRouterClient
+from src.openrouter import OpenRouterClient, StreamIncompleteError
 from src.config import AI_MODEL_OPTIONS
 
-class VoiceClonerInput(BaseModel):
-    """Input model for voice cloner functionality."""
-    writing_example_1: str = Field(..., description="First writing example to analyze voice style")
-    writing_example_2: str = Field(..., description="Second writing example to analyze voice style") 
-    writing_example_3: str = Field(..., description="Third writing example to analyze voice style")
-    new_piece_to_create: str = Field(..., description="Description of the new piece to create in the analyzed voice style")
-    model: str = Field(..., description="AI model to use for voice cloning")
-    username: str = Field(..., description="Username of the user making the request")
-    session_id: Optional[str] = Field(None, description="Session ID for tracking")
+@dataclass(slots=True, frozen=True)
+class VoiceClonerInput:
+    """Input model for voice cloner functionality.
+    
+    A plain dataclass: the strings are user-typed text and are checked by the
+    controller's _validate_input, so per-field model validation is not needed.
+    """
+    writing_example_1: str  # First writing example to analyze voice style
+    writing_example_2: str  # Second writing example to analyze voice style
+    writing_example_3: str  # Third writing example to analyze voice style
+    new_piece_to_create: str  # Text to reformat in the analyzed voice style
+    model: str  # AI model to use for voice cloning
+    username: str  # Username of the user making the request
+    session_id: Optional[str] = None  # Session ID for tracking
+    batch_size: int = 8  # Maximum number of text chunks refined concurrently for long inputs
+    
+    def __post_init__(self):
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
 
 class VoiceClonerOutput(BaseModel):
     """Output model for voice cloner results."""
@@ -28,9 +39,17 @@ class VoiceClonerOutput(BaseModel):
     confidence_score: int = Field(..., description="Confidence score (0-100) of how well the voice was cloned")
     iterations_completed: int = Field(..., description="Number of iterations completed during the refinement process")
     processing_time: float = Field(..., description="Time taken to process the request")
+    from_cache: bool = Field(False, description="Whether the result was replayed from the result cache")
+    fallback_used: bool = Field(False, description="Whether any part of the text got the basic fallback formatting")
 
 logger = logging.getLogger(__name__)
 
+# Patterns used by the chunker and the per-result style analysis
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\b\w+\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class RetryableError(Exception):
     """Base class for errors that should trigger retry logic."""
     pass
@@ -286,6 +305,41 @@ class PerformanceOptimizer:
         logger.info(f"Split text into {len(chunks)} chunks")
         return chunks
         
+    @staticmethod
+    def split_on_sentences(text: str, target: int = 4000) -> List[str]:
+        """Greedily pack whole sentences into chunks of at most ``target`` characters.
+        
+        Unlike ``chunk_large_text`` the chunks do not overlap, so the refined
+        chunks can be joined back together without duplicated text.
+        """
+        if len(text) <= target:
+            return [text]
+        
+        chunks = []
+        current = []
+        current_len = 0
+        
+        for sentence in _SENTENCE_BOUNDARY_RE.split(text):
+            # Hard-split sentences that alone exceed the target
+            while len(sentence) > target:
+                chunks.append(sentence[:target])
+                sentence = sentence[target:]
+            
+            # +1 for the space that rejoins the sentences
+            if current and current_len + 1 + len(sentence) > target:
+                chunks.append(" ".join(current))
+                current = []
+                current_len = 0
+            
+            current.append(sentence)
+            current_len += len(sentence) + (1 if current_len else 0)
+        
+        if current:
+            chunks.append(" ".join(current))
+        
+        logger.info(f"Split text into {len(chunks)} sentence-aligned chunks")
+        return chunks
+        
     @staticmethod
     def estimate_processing_time(text_length: int, model: str) -> float:
         """Estimate processing time based on text length and model."""
@@ -326,6 +380,8 @@ class PerformanceOptimizer:
 class VoiceStyleCache:
     """In-memory cache for voice style analysis results."""
     
+    cache_name = "voice style analysis"
+    
     def __init__(self, max_size: int = 100, ttl_hours: int = 24):
         self.cache: Dict[str, Dict[str, Any]] = {}
         self.max_size = max_size
@@ -347,14 +403,14 @@ class VoiceStyleCache:
             
             # Check if cache entry is still valid
             if datetime.now() - cached_item['timestamp'] < self.ttl:
-                logger.info(f"Cache hit for voice style analysis: {cache_key[:8]}...")
+                logger.info(f"Cache hit for {self.cache_name}: {cache_key[:8]}...")
                 return cached_item['data']
             else:
                 # Remove expired entry
                 del self.cache[cache_key]
                 logger.info(f"Cache entry expired and removed: {cache_key[:8]}...")
         
-        logger.info(f"Cache miss for voice style analysis: {cache_key[:8]}...")
+        logger.info(f"Cache miss for {self.cache_name}: {cache_key[:8]}...")
         return None
     
     def set(self, examples: list[str], analysis_data: Dict[str, Any]) -> None:
@@ -373,7 +429,7 @@ class VoiceStyleCache:
             'data': analysis_data,
             'timestamp': datetime.now()
         }
-        logger.info(f"Cached voice style analysis: {cache_key[:8]}...")
+        logger.info(f"Cached {self.cache_name}: {cache_key[:8]}...")
     
     def invalidate(self, examples: list[str]) -> bool:
         """Invalidate cache entry for specific examples."""
@@ -403,6 +459,20 @@ class VoiceStyleCache:
             'ttl_hours': self.ttl.total_seconds() / 3600
         }
 
+class VoiceResultCache(VoiceStyleCache):
+    """In-memory cache for final voice cloning results (exact-match only)."""
+    
+    cache_name = "voice cloning result"
+    
+    def _generate_cache_key(self, examples: list[str]) -> str:
+        """Generate a cache key from the examples, text and model, keeping order and case."""
+        return hashlib.sha256("\x1f".join(examples).encode()).hexdigest()
+
+# Shared by every controller instance: the Streamlit page (and with it the
+# controller) is rebuilt on each rerun, which would otherwise discard the cache.
+_shared_style_cache = VoiceStyleCache(max_size=100, ttl_hours=24)
+_shared_result_cache = VoiceResultCache(max_size=32, ttl_hours=24)
+
 class VoiceClonerController:
     """Controller for voice cloner functionality."""
     
@@ -414,7 +484,8 @@ class VoiceClonerController:
     
     def __init__(self):
         self.openrouter_client = OpenRouterClient()
-        self.style_cache = VoiceStyleCache(max_size=100, ttl_hours=24)
+        self.style_cache = _shared_style_cache
+        self.result_cache = _shared_result_cache
         self.request_queue = RequestQueue(max_concurrent=3, batch_size=5)
         self.performance_optimizer = PerformanceOptimizer()
         
@@ -461,15 +532,31 @@ class VoiceClonerController:
         
         logger.info(f"Input validation passed - Examples: {[len(ex) for ex in examples]} chars, Text: {text_length} chars")
     
-    async def _make_api_request_with_validation(self, prompt: str, model: str) -> str:
-        """Make API request with validation and error classification for retry logic."""
+    async def _make_api_request_with_validation(self, prompt: str, model: str,
+                                                on_text: Optional[Callable[[str], None]] = None) -> str:
+        """Make API request with validation and error classification for retry logic.
+        
+        When ``on_text`` is given the response is streamed and ``on_text`` receives
+        the text generated so far as it grows.
+        """
         try:
-            response_text = await self.openrouter_client.generate_response(
-                prompt=prompt,
-                system_prompt=None,  # Prompt already contains system instructions
-                temperature=0.7,
-                model_override=model
-            )
+            response_text = None
+            if on_text is not None:
+                try:
+                    response_text = await self._collect_streamed_response(prompt, model, on_text)
+                except StreamIncompleteError as e:
+                    # A cut-off stream is discarded, never returned as the answer
+                    logger.warning(f"Streaming failed, falling back to a buffered request: {e}")
+            
+            if not response_text:
+                response_text = await self.openrouter_client.generate_response(
+                    prompt=prompt,
+                    system_prompt=None,  # Prompt already contains system instructions
+                    temperature=0.7,
+                    model_override=model
+                )
+                if on_text is not None and response_text:
+                    on_text(response_text)
             
             # Handle empty or invalid response
             if not response_text or len(response_text.strip()) < 10:
@@ -498,11 +585,32 @@ class VoiceClonerController:
                 # Non-retryable error
                 raise ValueError(f"API request failed: {str(e)}")
     
+    async def _collect_streamed_response(self, prompt: str, model: str,
+                                         on_text: Callable[[str], None]) -> str:
+        """Stream a response, reporting partial text every few tokens, and return the full text.
+
+        Raises StreamIncompleteError if the stream is cut off before it completes.
+        """
+        buf = []
+        async for token in self.openrouter_client.generate_response_stream(
+            prompt=prompt,
+            system_prompt=None,  # Prompt already contains system instructions
+            temperature=0.7,
+            model_override=model
+        ):
+            buf.append(token)
+            # Joining on every token is quadratic for long outputs
+            if len(buf) % 16 == 0:
+                on_text("".join(buf))
+        
+        response_text = "".join(buf)
+        on_text(response_text)
+        return response_text
+    
     def _analyze_single_text_style(self, text: str) -> dict:
         """Analyze style characteristics of a single text."""
-        import re
         
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         if not sentences:
@@ -574,7 +682,8 @@ class VoiceClonerController:
             cached_analysis = self.style_cache.get(examples)
             if cached_analysis:
                 logger.info("Using cached voice style analysis")
-                # Add current text analysis to cached data
+                # Add current text analysis to a copy so the shared cache entry stays clean
+                cached_analysis = dict(cached_analysis)
                 cached_analysis['input_text'] = self._analyze_single_text_style(text_to_reformat)
                 cached_analysis['text_length'] = len(text_to_reformat)
                 return cached_analysis
@@ -834,8 +943,12 @@ Do not deliver results before completing the minimum iteration count.
             logger.error(f"Error in synchronous voice cloning wrapper: {str(e)}")
             raise e
 
-    async def process_voice_cloning(self, input_data: VoiceClonerInput) -> VoiceClonerOutput:
-        """Process voice cloning request asynchronously."""
+    async def process_voice_cloning(self, input_data: VoiceClonerInput,
+                                    on_text: Optional[Callable[[str], None]] = None) -> VoiceClonerOutput:
+        """Process voice cloning request asynchronously.
+        
+        If ``on_text`` is given the model output is streamed and passed to it as it grows.
+        """
         start_time = time.time()
         
         try:
@@ -854,7 +967,7 @@ Do not deliver results before completing the minimum iteration count.
             try:
                 # Use error recovery with retry logic
                 response_text = await self.error_recovery.retry_with_backoff(
-                    self._make_api_request_with_validation, prompt, input_data.model
+                    self._make_api_request_with_validation, prompt, input_data.model, on_text
                 )
                 
                 logger.info(f"API response received with length: {len(response_text) if response_text else 0}")
@@ -930,7 +1043,6 @@ Do not deliver results before completing the minimum iteration count.
                                            style_rules: str, response_text: str) -> int:
         """Calculate enhanced confidence score using multi-factor analysis."""
         try:
-            import re
             
             # Start with base score from AI response if available
             ai_confidence = 90  # Default
@@ -992,8 +1104,7 @@ Do not deliver results before completing the minimum iteration count.
             
             # Analyze average sentence length similarity
             def get_avg_sentence_length(text: str) -> float:
-                import re
-                sentences = re.split(r'[.!?]+', text)
+                sentences = _SENTENCE_SPLIT_RE.split(text)
                 sentences = [s.strip() for s in sentences if s.strip()]
                 if not sentences:
                     return 0
@@ -1021,7 +1132,6 @@ Do not deliver results before completing the minimum iteration count.
             examples = [input_data.writing_example_1, input_data.writing_example_2, input_data.writing_example_3]
             
             def count_punctuation_patterns(text: str) -> dict:
-                import re
                 return {
                     'exclamations': len(re.findall(r'!', text)),
                     'questions': len(re.findall(r'\?', text)),
@@ -1069,8 +1179,7 @@ Do not deliver results before completing the minimum iteration count.
             examples = [input_data.writing_example_1, input_data.writing_example_2, input_data.writing_example_3]
             
             def get_word_frequency(text: str) -> dict:
-                import re
-                words = re.findall(r'\b\w+\b', text.lower())
+                words = _WORD_RE.findall(text.lower())
                 freq = {}
                 for word in words:
                     if len(word) > 3:  # Only consider words longer than 3 chars
@@ -1112,8 +1221,7 @@ Do not deliver results before completing the minimum iteration count.
             examples = [input_data.writing_example_1, input_data.writing_example_2, input_data.writing_example_3]
             
             def analyze_structure(text: str) -> dict:
-                import re
-                sentences = re.split(r'[.!?]+', text)
+                sentences = _SENTENCE_SPLIT_RE.split(text)
                 sentences = [s.strip() for s in sentences if s.strip()]
                 
                 if not sentences:
@@ -1175,8 +1283,7 @@ Do not deliver results before completing the minimum iteration count.
                 quality_score += 5
             
             # Check for coherence indicators
-            import re
-            sentences = re.split(r'[.!?]+', final_piece)
+            sentences = _SENTENCE_SPLIT_RE.split(final_piece)
             sentences = [s.strip() for s in sentences if s.strip()]
             
             if len(sentences) > 1:
@@ -1220,7 +1327,6 @@ Do not deliver results before completing the minimum iteration count.
                 raise ValueError("Final piece is empty or too short after parsing")
             
             # Remove any confidence scores or iteration counts from the final piece
-            import re
             # Remove patterns like "Confidence: 95%" or "95% confidence" from final text
             final_piece = re.sub(r'(?i)confidence[:\s]*\d+%?', '', final_piece)
             final_piece = re.sub(r'(?i)\d+%?\s*confidence', '', final_piece)
@@ -1228,7 +1334,7 @@ Do not deliver results before completing the minimum iteration count.
             final_piece = re.sub(r'(?i)iteration\s*\d+', '', final_piece)
             final_piece = re.sub(r'(?i)round\s*\d+', '', final_piece)
             # Clean up extra whitespace
-            final_piece = re.sub(r'\s+', ' ', final_piece).strip()
+            final_piece = _WHITESPACE_RE.sub(' ', final_piece).strip()
             
             # Final validation after cleanup
             if not final_piece or len(final_piece.strip()) < 10:
@@ -1325,18 +1431,40 @@ Do not deliver results before completing the minimum iteration count.
         return self.style_cache.invalidate(examples)
     
     async def process_with_streaming(self, input_data: VoiceClonerInput, 
-                                   callback=None) -> VoiceClonerOutput:
-        """Process voice cloning with streaming updates for large texts."""
+                                   callback=None,
+                                   on_text: Optional[Callable[[str], None]] = None) -> VoiceClonerOutput:
+        """Process voice cloning with streaming updates for large texts.
+        
+        ``on_text`` receives partial model output for inputs processed in a single request.
+        """
         try:
             text_length = len(input_data.new_piece_to_create)
             
+            # Identical requests (e.g. resubmits after UI tweaks) are served from cache
+            cache_parts = [
+                input_data.writing_example_1,
+                input_data.writing_example_2,
+                input_data.writing_example_3,
+                input_data.new_piece_to_create,
+                input_data.model,
+            ]
+            cached_result = self.result_cache.get(cache_parts)
+            if cached_result:
+                return cached_result.model_copy(update={"processing_time": 0.0, "from_cache": True})
+            
             # For large texts, use chunking
             if text_length > 5000:
                 logger.info(f"Using chunked processing for large text: {text_length} chars")
-                return await self._process_chunked_text(input_data, callback)
+                result = await self._process_chunked_text(input_data, callback)
             else:
                 # Regular processing for smaller texts
-                return await self.process_voice_cloning(input_data)
+                result = await self.process_voice_cloning(input_data, on_text)
+            
+            # Degraded fallback output (whole or per chunk) should be retried
+            # next time, not replayed
+            if not result.fallback_used:
+                self.result_cache.set(cache_parts, result)
+            return result
                 
         except Exception as e:
             logger.error(f"Error in streaming processing: {str(e)}")
@@ -1347,51 +1475,56 @@ Do not deliver results before completing the minimum iteration count.
         """Process large text by breaking it into chunks."""
         start_time = time.time()
         
-        # Split text into chunks
-        chunks = self.performance_optimizer.chunk_large_text(
-            input_data.new_piece_to_create, max_chunk_size=2000
+        # Split text into non-overlapping, sentence-aligned chunks
+        chunks = self.performance_optimizer.split_on_sentences(
+            input_data.new_piece_to_create, target=4000
         )
         
-        processed_chunks = []
         total_chunks = len(chunks)
+        completed_chunks = 0
         
-        for i, chunk in enumerate(chunks):
-            if callback:
-                await callback(f"Processing chunk {i+1}/{total_chunks}")
+        # Chunks are independent LLM calls, so refine up to batch_size at once
+        semaphore = asyncio.Semaphore(input_data.batch_size)
+        
+        async def process_chunk(chunk: str) -> VoiceClonerOutput:
+            nonlocal completed_chunks
             
             # Create input for this chunk
-            chunk_input = VoiceClonerInput(
-                writing_example_1=input_data.writing_example_1,
-                writing_example_2=input_data.writing_example_2,
-                writing_example_3=input_data.writing_example_3,
-                new_piece_to_create=chunk,
-                model=input_data.model,
-                username=input_data.username,
-                session_id=input_data.session_id
-            )
+            chunk_input = replace(input_data, new_piece_to_create=chunk)
             
             # Process chunk
-            chunk_result = await self.process_voice_cloning(chunk_input)
-            processed_chunks.append(chunk_result.final_piece)
+            async with semaphore:
+                chunk_result = await self.process_voice_cloning(chunk_input)
             
+            completed_chunks += 1
             if callback:
-                progress = ((i + 1) / total_chunks) * 100
-                await callback(f"Progress: {progress:.1f}% ({i+1}/{total_chunks} chunks)")
+                progress = (completed_chunks / total_chunks) * 100
+                await callback(f"Progress: {progress:.1f}% ({completed_chunks}/{total_chunks} chunks)")
+            return chunk_result
+        
+        if callback:
+            await callback(f"Processing {total_chunks} chunks ({input_data.batch_size} at a time)")
+        
+        chunk_results = await asyncio.gather(*(process_chunk(chunk) for chunk in chunks))
         
-        # Combine results
-        final_text = " ".join(processed_chunks)
+        # Combine results (gather preserves chunk order)
+        final_text = " ".join(result.final_piece for result in chunk_results)
         processing_time = time.time() - start_time
         
         # Calculate aggregate metrics
-        avg_confidence = sum(chunk.confidence_score for chunk in []) / len(chunks) if chunks else 90
-        total_iterations = sum(chunk.iterations_completed for chunk in []) if chunks else 50
+        avg_confidence = sum(result.confidence_score for result in chunk_results) / len(chunk_results) if chunk_results else 90
+        total_iterations = sum(result.iterations_completed for result in chunk_results) if chunk_results else 50
+        
+        # A chunk that hit a rate limit or timeout was only basically formatted
+        fallback_used = any(result.fallback_used for result in chunk_results)
         
         return VoiceClonerOutput(
             final_piece=final_text,
             style_rules=f"Processed {total_chunks} chunks with consistent style application",
             confidence_score=int(avg_confidence),
             iterations_completed=total_iterations,
-            processing_time=processing_time
+            processing_time=processing_time,
+            fallback_used=fallback_used
         )
     
     async def process_with_queue(self, input_data: VoiceClonerInput, 
@@ -1453,7 +1586,8 @@ Do not deliver results before completing the minimum iteration count.
             'optimizer_available': True
         }
     
-    def get_available_models(self) -> dict:
+    @staticmethod
+    def get_available_models() -> dict:
         """Get available AI models."""
         return AI_MODEL_OPTIONS
     
@@ -1492,10 +1626,9 @@ Do not deliver results before completing the minimum iteration count.
         text = input_data.new_piece_to_create.strip()
         
         # Simple improvements: fix spacing, basic sentence structure
-        import re
         
         # Fix multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         # Ensure proper sentence spacing
         text = re.sub(r'([.!?])\s*', r'\1 ', text)
@@ -1525,5 +1658,6 @@ Do not deliver results before completing the minimum iteration count.
             style_rules="Fallback mode: Basic text formatting applied due to AI service unavailability",
             confidence_score=40,  # Low confidence for fallback
             iterations_completed=1,
-            processing_time=processing_time
+            processing_time=processing_time,
+            fallback_used=True
         )
\ No newline at end of file
@@ -1,15 +1,26 @@
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import Optional
 
-class VoiceClonerInput(BaseModel):
-    """Input model for voice cloner functionality."""
-    writing_example_1: str = Field(..., description="First writing example to analyze voice style")
-    writing_example_2: str = Field(..., description="Second writing example to analyze voice style") 
-    writing_example_3: str = Field(..., description="Third writing example to analyze voice style")
-    new_piece_to_create: str = Field(..., description="Description of the new piece to create in the analyzed voice style")
-    model: str = Field(..., description="AI model to use for voice cloning")
-    username: str = Field(..., description="Username of the user making the request")
-    session_id: Optional[str] = Field(None, description="Session ID for tracking")
+@dataclass(slots=True, frozen=True)
+class VoiceClonerInput:
+    """Input model for voice cloner functionality.
+    
+    A plain dataclass: the strings are user-typed text and are checked by the
+    controller's _validate_input, so per-field model validation is not needed.
+    """
+    writing_example_1: str  # First writing example to analyze voice style
+    writing_example_2: str  # Second writing example to analyze voice style
+    writing_example_3: str  # Third writing example to analyze voice style
+    new_piece_to_create: str  # Text to reformat in the analyzed voice style
+    model: str  # AI model to use for voice cloning
+    username: str  # Username of the user making the request
+    session_id: Optional[str] = None  # Session ID for tracking
+    batch_size: int = 8  # Maximum number of text chunks refined concurrently for long inputs
+    
+    def __post_init__(self):
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
 
 class VoiceClonerOutput(BaseModel):
     """Output model for voice cloner results."""
@@ -6,7 +6,7 @@ import tempfile
 from pathlib import Path
 
 from src.notion_watcher import poll_notion_db
-from src.notion_research import run_deep_research  
+from src.notion_research import run_deep_research, run_deep_research_batch
 from src.notion_writer import publish_report
 from src.notion_scorer import run_project_scoring
 from src.notion_pusher import publish_ratings
@@ -157,30 +157,35 @@ def run_full_pipeline(pages: List[Dict[str, str]]):
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i, page in enumerate(pages):
-        page_id = page["page_id"]
-        title = page.get("title", "Untitled")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Deep research dominates the run time and is network-bound, so all
+        # cards are researched concurrently before the per-card publish steps
+        status_text.text(f"Researching {len(pages)} projects...")
+        results = run_deep_research_batch([page["page_id"] for page in pages], tmp_dir)
         
-        status_text.text(f"Processing {i+1}/{len(pages)}: {title}")
-        
-        try:
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                tmp_path = Path(tmp_dir)
+        for i, (page, result) in enumerate(zip(pages, results)):
+            page_id = page["page_id"]
+            title = page.get("title", "Untitled")
+            
+            status_text.text(f"Processing {i+1}/{len(pages)}: {title}")
+            
+            try:
+                if isinstance(result, BaseException):
+                    raise result
                 
                 # Run pipeline steps
-                md_path = tmp_path / f"research_{page_id}.md"
-                report_path = run_deep_research(page_id, md_path)
+                report_path = result
                 notion_url = publish_report(page_id, report_path)
                 json_path = run_project_scoring(page_id)
                 ratings_db_id = publish_ratings(page_id)
                 
                 st.write(f"✅ Completed: {title}")
                 
-        except Exception as e:
-            st.write(f"❌ Failed: {title} - {str(e)}")
-            continue
-        
-        progress_bar.progress((i + 1) / len(pages))
+            except Exception as e:
+                st.write(f"❌ Failed: {title} - {str(e)}")
+                continue
+            
+            progress_bar.progress((i + 1) / len(pages))
     
     status_text.text("Pipeline completed!")
     st.success(f"Processed {len(pages)} projects")
@@ -14,20 +14,37 @@ The bulk of the actual research logic is delegated to the external
 # Standard library imports
 import os
 import asyncio
+import atexit
+import hashlib
+import json
 import logging
 import pathlib
+import re
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, cast
+from typing import Any, Callable, Dict, Iterable, Iterator, List, cast
 
 # Third-party imports
 import httpx
+
+try:
+    import h2  # noqa: F401 – optional, lets httpx negotiate HTTP/2
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 from notion_client import Client as NotionClient
 from notion_client.errors import RequestTimeoutError
 from notion_client import APIResponseError
 from tenacity import (
+    AsyncRetrying,
     RetryError,
     Retrying,
     retry_if_exception,
+    retry_if_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
@@ -36,7 +53,12 @@ from tenacity import (
 # from web_research.deep_research import deep_research as _deep_research
 # from web_research.deep_research import write_final_report as _write_final_report
 
-__all__ = ["run_deep_research"]
+__all__ = [
+    "run_deep_research",
+    "run_deep_research_async",
+    "run_deep_research_many",
+    "run_deep_research_batch",
+]
 
 """Deep-Research wrapper utilities.
 
@@ -80,9 +102,11 @@ if not _logger.handlers:  # Prevent duplication during pytest reloads
 # Try to route deep_research internal logger to the same file if available
 try:
     from web_research.utils import logger as _dp_logger  # noqa: E402
-    if _handler and not any(isinstance(h, logging.FileHandler) and h.baseFilename == _handler.baseFilename for h in _dp_logger.handlers):
+    # Flag on the logger itself so re-imports (pytest reloads) skip the handler scan
+    if _handler and not getattr(_dp_logger, "_research_log_installed", False):
         _dp_logger.addHandler(_handler)
         _dp_logger.setLevel(logging.INFO)
+        _dp_logger._research_log_installed = True  # type: ignore[attr-defined]
 except ImportError:
     # web_research module not available, skip
     pass
@@ -91,17 +115,49 @@ except ImportError:
 # Internal utilities
 # ---------------------------------------------------------------------------
 
+# One client (and its pooled httpx connections) is shared by every helper; it
+# is rebuilt only if NOTION_TOKEN changes.
+_notion_client: NotionClient | None = None
+_notion_http_client: httpx.Client | None = None
+_notion_client_token: str | None = None
+_notion_client_lock = threading.Lock()
+
+
+def _close_notion_client() -> None:
+    """Close the pooled connections of the shared Notion client, if any."""
+    global _notion_client, _notion_http_client
+    with _notion_client_lock:
+        if _notion_http_client is not None:
+            _notion_http_client.close()
+        _notion_client = None
+        _notion_http_client = None
+
+
+atexit.register(_close_notion_client)
+
+
 def _build_notion_client() -> NotionClient:
-    """Create a configured Notion client from ``NOTION_TOKEN`` env var."""
-    import os
+    """Return the shared Notion client configured from ``NOTION_TOKEN`` env var."""
+    global _notion_client, _notion_http_client, _notion_client_token
 
     token = os.getenv("NOTION_TOKEN")
     if not token:
         raise RuntimeError("Environment variable NOTION_TOKEN is required.")
 
-    timeout_cfg = httpx.Timeout(180.0, connect=10.0)
-    http_client = httpx.Client(timeout=timeout_cfg)
-    return NotionClient(auth=token, client=http_client)
+    with _notion_client_lock:
+        if _notion_client is None or _notion_client_token != token:
+            timeout_cfg = httpx.Timeout(180.0, connect=10.0)
+            # Pagination and the concurrent fetch threads all hit api.notion.com;
+            # keep connections warm and multiplex them over HTTP/2 when possible.
+            limits = httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=30.0)
+            http_client = httpx.Client(http2=_HTTP2_AVAILABLE, timeout=timeout_cfg, limits=limits)
+            if _notion_http_client is not None:
+                # Token rotated – release the old pool instead of leaking it
+                _notion_http_client.close()
+            _notion_client = NotionClient(auth=token, client=http_client)
+            _notion_http_client = http_client
+            _notion_client_token = token
+        return _notion_client
 
 
 def _is_retryable(exc: Exception) -> bool:  # pragma: no cover
@@ -113,131 +169,275 @@ def _is_retryable(exc: Exception) -> bool:  # pragma: no cover
     return False
 
 
-def _tenacity() -> Retrying:  # small helper for consistent retry policy
-    return Retrying(
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=2),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception(_is_retryable),
-        reraise=True,
-    )
+_backoff = wait_exponential(multiplier=0.5, min=0.5, max=2)
+
+
+def _notion_wait(retry_state: Any) -> float:
+    """Honour Notion's ``Retry-After`` on 429s, else back off exponentially."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    headers = getattr(exc, "headers", None)
+    if headers is not None:
+        try:
+            return min(float(headers.get("retry-after", "")), 30.0)
+        except ValueError:
+            pass
+    return _backoff(retry_state)
+
+
+# Shared retry policy for Notion calls.  Iterating a Retrying object starts a
+# fresh call state (statistics are thread-local), so one instance can serve
+# every call, including the concurrent fetch threads.
+_RETRYER = Retrying(
+    wait=_notion_wait,
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception(_is_retryable),
+    reraise=True,
+)
+
+
+class _RateLimiter:
+    """Thread-safe token bucket: at most *rate* calls per second on average."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self._interval = 1.0 / rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) / self._interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) * self._interval
+            time.sleep(delay)
+
+
+# Notion allows ~3 requests/s per integration.  The fetch threads, page
+# prefetchers and DDQ checks all share this bucket so they queue locally
+# instead of tripping 429s and burning retry attempts.
+_NOTION_LIMITER = _RateLimiter(float(os.getenv("NOTION_MAX_RPS", 3)), burst=3)
+
+
+def _list_children_page(client: NotionClient, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch one page of ``blocks.children.list`` with rate limiting and retries."""
+    for attempt in _RETRYER:
+        with attempt:
+            _NOTION_LIMITER.acquire()
+            resp = cast(Dict[str, Any], client.blocks.children.list(**payload))
+    return resp
 
 
 def _list_blocks(client: NotionClient, block_id: str) -> List[Dict[str, Any]]:
     """Return *all* child blocks under the provided block (handles pagination)."""
 
     blocks: List[Dict[str, Any]] = []
-    cursor: str | None = None
+    payload: Dict[str, Any] = {"block_id": block_id, "page_size": 100}
 
     while True:
-        payload: Dict[str, Any] = {"block_id": block_id, "page_size": 100}
-        if cursor:
-            payload["start_cursor"] = cursor
-
-        for attempt in _tenacity():
-            with attempt:
-                resp = cast(Dict[str, Any], client.blocks.children.list(**payload))
+        resp = _list_children_page(client, payload)
 
         blocks.extend(cast(List[Dict[str, Any]], resp.get("results", [])))
 
         if not resp.get("has_more", False):
             break
-        cursor = cast(str, resp.get("next_cursor"))
+        payload["start_cursor"] = cast(str, resp.get("next_cursor"))
     return blocks
 
 
+def _iter_block_pages(client: NotionClient, block_id: str) -> Iterator[List[Dict[str, Any]]]:
+    """Yield child blocks one API page at a time, prefetching the next page.
+
+    Notion pagination is cursor-chained, so pages cannot be fetched in
+    parallel; instead the request for page N+1 runs in a worker thread while
+    the caller converts page N.
+    """
+
+    def fetch(cursor: str | None) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"block_id": block_id, "page_size": 100}
+        if cursor:
+            payload["start_cursor"] = cursor
+        return _list_children_page(client, payload)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(fetch, None)
+        while True:
+            resp = pending.result()
+            has_more = resp.get("has_more", False)
+            if has_more:
+                pending = pool.submit(fetch, cast(str, resp.get("next_cursor")))
+            yield cast(List[Dict[str, Any]], resp.get("results", []))
+            if not has_more:
+                break
+
+
+def _partition_card_blocks(blocks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Split a card's top-level blocks into DDQ pages, call-note pages and body."""
+
+    sections: Dict[str, List[Dict[str, Any]]] = {"ddq": [], "calls": [], "freeform": []}
+    for blk in blocks:
+        # Free-form content is everything written directly on the card; other
+        # child-pages (Ratings, etc.) belong to no section.
+        if blk.get("type") != "child_page":
+            sections["freeform"].append(blk)
+            continue
+        title = blk["child_page"]["title"].lower()
+        if title.startswith("due diligence"):
+            sections["ddq"].append(blk)
+        elif title.startswith("call notes"):
+            sections["calls"].append(blk)
+    return sections
+
+
+def _card_sections(client: NotionClient, page_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    """List a card's top-level blocks and partition them into sections.
+
+    A research run lists the card once and passes the result to each
+    ``_fetch_*`` helper via ``sections=``; standalone calls list it afresh,
+    so edits to the card are always picked up.
+    """
+
+    return _partition_card_blocks(_list_blocks(client, page_id))
+
+
+# Annotations rendered as Markdown; colour/underline are dropped
+_MARKDOWN_ANNOTATIONS = ("bold", "italic", "strikethrough", "code")
+
+
+def _rich_to_text(rich: List[Dict[str, Any]]) -> str:
+    """Enhanced rich text extraction with formatting preservation."""
+    parts: List[str] = []
+    for part in rich:
+        text = part.get("plain_text", "")
+        annotations = part.get("annotations", {})
+
+        # Most runs in a DDQ are plain text – skip the formatting checks
+        if not part.get("href") and not any(annotations.get(a) for a in _MARKDOWN_ANNOTATIONS):
+            parts.append(text)
+            continue
+
+        # Apply formatting
+        if annotations.get("bold", False):
+            text = f"**{text}**"
+        if annotations.get("italic", False):
+            text = f"*{text}*"
+        if annotations.get("strikethrough", False):
+            text = f"~~{text}~~"
+        if annotations.get("code", False):
+            text = f"`{text}`"
+        
+        # Handle links
+        if part.get("href"):
+            text = f"[{text}]({part['href']})"
+            
+        parts.append(text)
+    return "".join(parts)
+
+
+def _prefixed(prefix: str) -> Callable[[Dict[str, Any]], str]:
+    """Handler for text blocks rendered as ``prefix + text`` (empty stays empty)."""
+    def handler(data: Dict[str, Any]) -> str:
+        content = _rich_to_text(data.get("rich_text", []))
+        return f"{prefix}{content}" if content else ""
+    return handler
+
+
+def _to_do_to_markdown(data: Dict[str, Any]) -> str:
+    chk = "x" if data.get("checked", False) else " "
+    content = _rich_to_text(data.get("rich_text", []))
+    return f"- [{chk}] {content}" if content else ""
+
+
+def _callout_to_markdown(data: Dict[str, Any]) -> str:
+    icon = data.get("icon", {}).get("emoji", "💡")
+    content = _rich_to_text(data.get("rich_text", []))
+    return f"{icon} {content}" if content else ""
+
+
+def _code_to_markdown(data: Dict[str, Any]) -> str:
+    language = data.get("language", "")
+    content = _rich_to_text(data.get("rich_text", []))
+    return f"```{language}\n{content}\n```" if content else ""
+
+
+def _image_to_markdown(data: Dict[str, Any]) -> str:
+    url = data.get("external", {}).get("url") or data.get("file", {}).get("url", "")
+    caption_parts = data.get("caption", [])
+    caption = _rich_to_text(caption_parts) if caption_parts else ""
+    if url:
+        return f"![{caption}]({url})" if caption else f"![Image]({url})"
+    return "[Image]"
+
+
+def _embed_to_markdown(data: Dict[str, Any]) -> str:
+    url = data.get("url", "")
+    return f"[Embedded content: {url}]" if url else "[Embedded content]"
+
+
+def _bookmark_to_markdown(data: Dict[str, Any]) -> str:
+    url = data.get("url", "")
+    caption_parts = data.get("caption", [])
+    caption = _rich_to_text(caption_parts) if caption_parts else url
+    return f"[Bookmark: {caption}]({url})" if url else "[Bookmark]"
+
+
+def _equation_to_markdown(data: Dict[str, Any]) -> str:
+    expression = data.get("expression", "")
+    return f"${expression}$" if expression else ""
+
+
+# Block type -> converter, looked up once per block
+_BLOCK_HANDLERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "paragraph": lambda data: _rich_to_text(data.get("rich_text", [])),
+    "quote": _prefixed("> "),
+    "callout": _callout_to_markdown,
+    "toggle": _prefixed("▶ "),
+    "heading_1": _prefixed("# "),
+    "heading_2": _prefixed("## "),
+    "heading_3": _prefixed("### "),
+    "bulleted_list_item": _prefixed("- "),
+    "numbered_list_item": _prefixed("1. "),
+    "to_do": _to_do_to_markdown,
+    "code": _code_to_markdown,
+    "divider": lambda data: "---",
+    # Basic table support - would need more complex handling for full tables
+    "table": lambda data: "[Table content - see original Notion page for details]",
+    "image": _image_to_markdown,
+    "embed": _embed_to_markdown,
+    "bookmark": _bookmark_to_markdown,
+    "equation": _equation_to_markdown,
+}
+
+# Block types that are expected to produce no text
+_SILENT_BLOCK_TYPES = frozenset({"child_page", "child_database", "link_preview", "unsupported"})
+
+
 def _notion_block_to_markdown(block: Dict[str, Any]) -> str:
     """Enhanced Notion block->Markdown converter with better content extraction."""
 
     b_type: str = block.get("type", "unknown")
-    data = block.get(b_type, {})  # type: ignore[arg-type]
-
-    def _rich_to_text(rich: List[Dict[str, Any]]) -> str:
-        """Enhanced rich text extraction with formatting preservation."""
-        result = ""
-        for part in rich:
-            text = part.get("plain_text", "")
-            annotations = part.get("annotations", {})
-            
-            # Apply formatting
-            if annotations.get("bold", False):
-                text = f"**{text}**"
-            if annotations.get("italic", False):
-                text = f"*{text}*"
-            if annotations.get("strikethrough", False):
-                text = f"~~{text}~~"
-            if annotations.get("code", False):
-                text = f"`{text}`"
-            
-            # Handle links
-            if part.get("href"):
-                text = f"[{text}]({part['href']})"
-                
-            result += text
-        return result
-
-    # Handle different block types with enhanced content extraction
-    if b_type == "paragraph":
-        return _rich_to_text(data.get("rich_text", []))
-    elif b_type == "quote":
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"> {content}" if content else ""
-    elif b_type == "callout":
-        icon = data.get("icon", {}).get("emoji", "💡")
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"{icon} {content}" if content else ""
-    elif b_type == "toggle":
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"▶ {content}" if content else ""
-    elif b_type in {"heading_1", "heading_2", "heading_3"}:
-        hashes = "#" * int(b_type[-1])
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"{hashes} {content}" if content else ""
-    elif b_type == "bulleted_list_item":
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"- {content}" if content else ""
-    elif b_type == "numbered_list_item":
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"1. {content}" if content else ""
-    elif b_type == "to_do":
-        chk = "x" if data.get("checked", False) else " "
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"- [{chk}] {content}" if content else ""
-    elif b_type == "code":
-        language = data.get("language", "")
-        content = _rich_to_text(data.get("rich_text", []))
-        return f"```{language}\n{content}\n```" if content else ""
-    elif b_type == "divider":
-        return "---"
-    elif b_type == "table":
-        # Basic table support - would need more complex handling for full tables
-        return "[Table content - see original Notion page for details]"
-    elif b_type == "image":
-        url = data.get("external", {}).get("url") or data.get("file", {}).get("url", "")
-        caption_parts = data.get("caption", [])
-        caption = _rich_to_text(caption_parts) if caption_parts else ""
-        if url:
-            return f"![{caption}]({url})" if caption else f"![Image]({url})"
-        return "[Image]"
-    elif b_type == "embed":
-        url = data.get("url", "")
-        return f"[Embedded content: {url}]" if url else "[Embedded content]"
-    elif b_type == "bookmark":
-        url = data.get("url", "")
-        caption_parts = data.get("caption", [])
-        caption = _rich_to_text(caption_parts) if caption_parts else url
-        return f"[Bookmark: {caption}]({url})" if url else "[Bookmark]"
-    elif b_type == "equation":
-        expression = data.get("expression", "")
-        return f"${expression}$" if expression else ""
+    handler = _BLOCK_HANDLERS.get(b_type)
+    if handler is not None:
+        return handler(block.get(b_type, {}))  # type: ignore[arg-type]
     
     # Log unsupported block types for debugging
-    if b_type not in {"child_page", "child_database", "link_preview", "unsupported"}:
-        _logger.debug(f"Unsupported block type: {b_type}")
+    if b_type not in _SILENT_BLOCK_TYPES:
+        _logger.debug("Unsupported block type: %s", b_type)
     
     # fallback – ignore unsupported blocks but don't lose content
     return ""
 
 
+def _markdown_lines(blocks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Lazily convert *blocks* to Markdown, dropping blocks that render empty."""
+    return filter(None, (_notion_block_to_markdown(blk).rstrip() for blk in blocks))
+
+
 # ---------------------------------------------------------------------------
 # Additional helper – detect whether a DDQ child page has been marked as
 # completed.  We mirror the logic used in ``watcher.py`` so that both modules
@@ -257,7 +457,11 @@ def _ddq_is_completed(client: NotionClient, ddq_block_id: str) -> bool:
     """
 
     # Fetch **all** blocks under the questionnaire page (pagination handled)
-    blocks = _list_blocks(client, ddq_block_id)
+    return _blocks_mark_completed(_list_blocks(client, ddq_block_id))
+
+
+def _blocks_mark_completed(blocks: List[Dict[str, Any]]) -> bool:
+    """Apply the ``_ddq_is_completed`` heuristic to an already fetched listing."""
 
     # Walk blocks in reverse order so we reach the completion marker sooner.
     for blk in reversed(blocks):
@@ -284,8 +488,13 @@ def _ddq_is_completed(client: NotionClient, ddq_block_id: str) -> bool:
 # Modified DDQ fetcher – pick the *completed* questionnaire if multiple exist
 # ---------------------------------------------------------------------------
 
-def _fetch_ddq_markdown(page_id: str) -> str:
-    """Return Markdown for the *completed* DDQ questionnaire under *page_id*.
+# Upper bound on DDQ candidate pages listed at once (cards rarely have more
+# than two or three questionnaires).
+_DDQ_CHECK_WORKERS = 4
+
+
+def _iter_ddq_lines(page_id: str, sections: Dict[str, List[Dict[str, Any]]] | None = None) -> Iterator[str]:
+    """Return an iterator over the Markdown lines of the *completed* DDQ under *page_id*.
 
     If multiple "Due Diligence …" child-pages exist we locate the one that
     carries a completion mark (✅).  This guarantees that the deep-research
@@ -297,30 +506,32 @@ def _fetch_ddq_markdown(page_id: str) -> str:
 
     # Gather **all** child pages whose title begins with "Due Diligence" – the
     # card may contain separate internal/external questionnaires.
-    blocks = _list_blocks(client, page_id)
-    ddq_candidates: List[Dict[str, Any]] = [
-        b
-        for b in blocks
-        if b.get("type") == "child_page"
-        and b["child_page"]["title"].lower().startswith("due diligence")
-    ]
+    ddq_candidates = (sections or _card_sections(client, page_id))["ddq"]
 
     # DEBUG: Log all DDQ candidates found
     candidate_titles = [b["child_page"]["title"] for b in ddq_candidates]
     _logger.info("action=ddq.candidates page_id=%s candidates=%s", page_id, candidate_titles)
     
-    # Prefer the first questionnaire that is marked as completed.
+    # Prefer the first questionnaire that is marked as completed.  Each check
+    # paginates a whole child page, so list the candidates concurrently;
+    # ``map`` still yields in card order, keeping the selection unchanged.
+    # The selected page's listing is kept and converted below rather than
+    # fetched a second time.
     ddq_block: Dict[str, Any] | None = None
-    for cand in ddq_candidates:
-        cand_id = cast(str, cand["id"])
-        cand_title = cand["child_page"]["title"]
-        is_completed = _ddq_is_completed(client, cand_id)
-        _logger.info("action=ddq.candidate_check page_id=%s candidate=%s completed=%s", page_id, cand_title, is_completed)
-        
-        if is_completed:
-            ddq_block = cand
-            _logger.info("action=ddq.selected page_id=%s selected=%s", page_id, cand_title)
-            break
+    ddq_blocks: List[Dict[str, Any]] = []
+    workers = max(1, min(len(ddq_candidates), _DDQ_CHECK_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        listings = pool.map(lambda c: _list_blocks(client, cast(str, c["id"])), ddq_candidates)
+        for cand, cand_blocks in zip(ddq_candidates, listings):
+            cand_title = cand["child_page"]["title"]
+            is_completed = _blocks_mark_completed(cand_blocks)
+            _logger.info("action=ddq.candidate_check page_id=%s candidate=%s completed=%s", page_id, cand_title, is_completed)
+
+            if is_completed:
+                ddq_block = cand
+                ddq_blocks = cand_blocks
+                _logger.info("action=ddq.selected page_id=%s selected=%s", page_id, cand_title)
+                break
 
     if ddq_block is None:
         titles = ", ".join(b["child_page"]["title"] for b in ddq_candidates) or "<none>"
@@ -329,19 +540,31 @@ def _fetch_ddq_markdown(page_id: str) -> str:
             f"Candidates inspected: {titles}"
         )
 
-    ddq_id = cast(str, ddq_block["id"])
-    ddq_blocks = _list_blocks(client, ddq_id)
+    # Selection above happens eagerly so a missing DDQ surfaces on call, before
+    # a caller opens an output file; conversion happens lazily as lines are consumed.
+    return _markdown_lines(ddq_blocks)
 
-    markdown_lines: List[str] = []
-    for blk in ddq_blocks:
-        text = _notion_block_to_markdown(blk).rstrip()
-        if text:
-            markdown_lines.append(text)
 
+def _fetch_ddq_markdown(page_id: str, sections: Dict[str, List[Dict[str, Any]]] | None = None) -> str:
+    """Return Markdown for the *completed* DDQ questionnaire under *page_id*."""
+    return "\n".join(_iter_ddq_lines(page_id, sections))
+
+
+def _write_ddq_markdown(page_id: str, ddq_md_path: Path,
+                        sections: Dict[str, List[Dict[str, Any]]] | None = None) -> str:
+    """Fetch the DDQ, writing it to *ddq_md_path* line by line, and return it."""
+    lines = _iter_ddq_lines(page_id, sections)
+    markdown_lines: List[str] = []
+    with ddq_md_path.open("w", encoding="utf-8") as fh:
+        for line in lines:
+            if markdown_lines:
+                fh.write("\n")
+            fh.write(line)
+            markdown_lines.append(line)
     return "\n".join(markdown_lines)
 
 
-def _fetch_calls_text(page_id: str) -> str:
+def _fetch_calls_text(page_id: str, sections: Dict[str, List[Dict[str, Any]]] | None = None) -> str:
     """Return Markdown-like text contained in the *Call Notes* child-page.
 
     If the card does not include a *Call Notes* child-page, an empty string
@@ -352,109 +575,193 @@ def _fetch_calls_text(page_id: str) -> str:
     client = _build_notion_client()
 
     # Locate child-pages named *Call Notes* (case-insensitive, allow prefix)
-    top_blocks = _list_blocks(client, page_id)
-    call_note_pages: List[Dict[str, Any]] = [
-        b
-        for b in top_blocks
-        if b.get("type") == "child_page"
-        and b["child_page"]["title"].lower().startswith("call notes")
-    ]
+    call_note_pages = (sections or _card_sections(client, page_id))["calls"]
 
     if not call_note_pages:
         return ""  # nothing found – optional context
 
     page = call_note_pages[0]  # take the first match
     call_id = cast(str, page["id"])
-    blocks = _list_blocks(client, call_id)
 
-    lines: List[str] = []
-    for blk in blocks:
-        text = _notion_block_to_markdown(blk).rstrip()
-        if text:
-            lines.append(text)
-    return "\n".join(lines)
+    return "\n".join(
+        line for blocks in _iter_block_pages(client, call_id) for line in _markdown_lines(blocks)
+    )
 
 
-def _fetch_freeform_text(page_id: str) -> str:
+def _fetch_freeform_text(page_id: str, sections: Dict[str, List[Dict[str, Any]]] | None = None) -> str:
     """Return Markdown-like text from the *main card body* (non-child blocks)."""
 
     client = _build_notion_client()
-    blocks = _list_blocks(client, page_id)
 
-    lines: List[str] = []
-    for blk in blocks:
-        # Skip child-pages (DDQs, Call Notes, Ratings, etc.) – we only want
-        # the free-form content directly written on the card itself.
-        if blk.get("type") == "child_page":
-            continue
+    # Child-pages (DDQs, Call Notes, Ratings, etc.) are excluded – we only
+    # want the free-form content directly written on the card itself.
+    return "\n".join(_markdown_lines((sections or _card_sections(client, page_id))["freeform"]))
 
-        text = _notion_block_to_markdown(blk).rstrip()
-        if text:
-            lines.append(text)
 
-    return "\n".join(lines)
+# ---------------------------------------------------------------------------
+# DDQ pruning – drop text that costs prompt tokens without informing analysis
+# ---------------------------------------------------------------------------
+DDQ_MAX_PROMPT_CHARS = 30000
+DDQ_MAX_LIST_ITEMS = 20
+_LIST_ITEM_PREFIXES = ("- ", "1. ")
+
+
+def _heading_level(line: str) -> int:
+    """Return the Markdown heading level of *line*, or 0 if it is not a heading."""
+    level = len(line) - len(line.lstrip("#"))
+    return level if 0 < level <= 6 and line[level:level + 1] == " " else 0
+
+
+def _prune_ddq(md: str, max_chars: int = DDQ_MAX_PROMPT_CHARS) -> str:
+    """Return a trimmed copy of DDQ Markdown for use in the research prompt.
+
+    Drops headings whose section is empty, collapses consecutive duplicate
+    lines, shortens list runs to their first ``DDQ_MAX_LIST_ITEMS`` items and
+    finally hard-caps the result at *max_chars*.
+    """
+
+    lines = [line for line in md.splitlines() if line.strip()]
+
+    # (b) collapse consecutive duplicates (repeated navigation/boilerplate)
+    deduped: List[str] = []
+    for line in lines:
+        if not deduped or line != deduped[-1]:
+            deduped.append(line)
+
+    # (a) drop headings directly followed by a heading of the same or a
+    # higher level (or by the end of the document)
+    kept: List[str] = []
+    for i, line in enumerate(deduped):
+        level = _heading_level(line)
+        if level:
+            next_level = _heading_level(deduped[i + 1]) if i + 1 < len(deduped) else 1
+            if next_level and next_level <= level:
+                continue
+        kept.append(line)
+
+    # (c) shorten long list runs
+    pruned: List[str] = []
+    run_length = 0
+    for line in kept:
+        if line.startswith(_LIST_ITEM_PREFIXES):
+            run_length += 1
+            if run_length > DDQ_MAX_LIST_ITEMS:
+                continue
+        elif run_length > DDQ_MAX_LIST_ITEMS:
+            pruned.append(f"... ({run_length - DDQ_MAX_LIST_ITEMS} more)")
+            run_length = 0
+        else:
+            run_length = 0
+        pruned.append(line)
+    if run_length > DDQ_MAX_LIST_ITEMS:
+        pruned.append(f"... ({run_length - DDQ_MAX_LIST_ITEMS} more)")
+
+    # (d) hard cap
+    result = "\n".join(pruned)
+    if len(result) > max_chars:
+        result = result[:max_chars].rsplit("\n", 1)[0] + "\n... (truncated)"
+    return result
 
 
 # Research configuration from environment variables
 BREADTH = int(os.getenv("RESEARCH_BREADTH",1))
 DEPTH = int(os.getenv("RESEARCH_DEPTH",1))
 CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY",1))
+# Cards researched at once by run_deep_research_many (Notion calls are still
+# bounded by the shared rate limiter)
+CARD_CONCURRENCY = int(os.getenv("RESEARCH_CARD_CONCURRENCY", 4))
 
-async def _deep_research_runner(
-    page_id: str,
-    ddq_md_path: Path,
-    *,
-    breadth: int = BREADTH,
-    depth: int = DEPTH,
-    concurrency: int = CONCURRENCY,
-) -> Path:
-    """Internal async helper that orchestrates the deep-research run."""
+# Bounds for the report generation call so a stalled provider cannot hold the
+# worker indefinitely or run up an unbounded completion
+LLM_TIMEOUT = float(os.getenv("RESEARCH_LLM_TIMEOUT", 300))
+LLM_MAX_TOKENS = int(os.getenv("RESEARCH_MAX_TOKENS", 4096))
+LLM_MAX_ATTEMPTS = int(os.getenv("RESEARCH_LLM_MAX_ATTEMPTS", 3))
+LLM_TEMPERATURE = float(os.getenv("RESEARCH_TEMPERATURE", 0.2))
 
-    _logger.info("action=run.start page_id=%s", page_id)
+# Reports are deterministic enough per (prompt, model, bounds) that re-runs
+# after crashes or reruns can reuse the previous response from disk.
+LLM_CACHE_ENABLED = os.getenv("RESEARCH_LLM_CACHE", "1") != "0"
+LLM_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+_LLM_CACHE_DIR = pathlib.Path("cache/llm_responses")
 
-    # ------------------------------------------------------------------
-    # 1. Fetch core Notion content (DDQ + supplementary context) and persist
-    #    the DDQ to disk for traceability.
-    # ------------------------------------------------------------------
-    ddq_text = _fetch_ddq_markdown(page_id)
-    calls_text = _fetch_calls_text(page_id)
-    freeform_text = _fetch_freeform_text(page_id)
 
-    # Preserve the DDQ text exactly as before for audit/debug purposes
-    ddq_md_path.write_text(ddq_text, encoding="utf-8")
-    _logger.info("action=content.fetched ddq_bytes=%d calls_bytes=%d freeform_bytes=%d",
-                len(ddq_text), len(calls_text), len(freeform_text))
-    
-    # DEBUG: Log first 500 chars of each content section for debugging
-    _logger.info("action=content.preview ddq_start=%s", ddq_text[:500].replace('\n', '\\n') if ddq_text else "EMPTY")
-    _logger.info("action=content.preview calls_start=%s", calls_text[:500].replace('\n', '\\n') if calls_text else "EMPTY")
-    _logger.info("action=content.preview freeform_start=%s", freeform_text[:500].replace('\n', '\\n') if freeform_text else "EMPTY")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
 
-    # ------------------------------------------------------------------
-    # 2. Kick-off deep research
-    # ------------------------------------------------------------------
-    from src.openrouter import OpenRouterClient
-    client = OpenRouterClient()
-    model = os.getenv("OPENROUTER_PRIMARY_MODEL", "qwen/qwen3-30b-a3b:free")
 
-    # Build the prompt that will be fed into the deep-research agent.
-    header = os.getenv("DEEP_RESEARCH_PROMPT", "Analyze the following project content for investment due diligence:")
-    
-    # Create clearly separated content sections to avoid confusion
-    research_query = f"""{header}
+def _normalize_prompt(text: str) -> str:
+    """Drop whitespace that cannot change a prompt's meaning.
+
+    Trailing spaces are stripped from each line, runs of blank lines become a
+    single blank line and the ends are trimmed.  Line breaks are kept, since
+    Markdown tables, headings, lists and code blocks depend on them.
+    """
+    text = "\n".join(line.rstrip() for line in text.splitlines())
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def _llm_cache_key(system_prompt: str, prompt: str, model: str) -> str:
+    """Return a stable cache key for one report generation request.
+
+    Prompts are normalized with :func:`_normalize_prompt` before hashing so
+    cosmetic edits on the Notion card (trailing spaces, extra blank lines)
+    still hit the cache.
+    """
+    parts = (
+        _normalize_prompt(system_prompt),
+        _normalize_prompt(prompt),
+        model,
+        str(LLM_MAX_TOKENS),
+        str(LLM_TEMPERATURE),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _read_cached_response(key: str) -> str | None:
+    """Return a cached response younger than the max age, else ``None``."""
+    path = _LLM_CACHE_DIR / f"{key}.md"
+    try:
+        if time.time() - path.stat().st_mtime > LLM_CACHE_MAX_AGE_SECONDS:
+            return None
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def _write_cached_response(key: str, response: str, *, model: str, prompt: str) -> None:
+    """Persist a response and its metadata; failures are logged, not raised."""
+    try:
+        _LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (_LLM_CACHE_DIR / f"{key}.md").write_text(response, encoding="utf-8")
+        metadata = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "model": model,
+            "max_tokens": LLM_MAX_TOKENS,
+            "temperature": LLM_TEMPERATURE,
+            "prompt_chars": len(prompt),
+            "response_chars": len(response),
+        }
+        (_LLM_CACHE_DIR / f"{key}.json").write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+    except OSError as e:  # pragma: no cover – cache is best-effort
+        _logger.warning("action=llm_cache.write_failed key=%s error=%s", key, e)
+
+# ---------------------------------------------------------------------------
+# Prompt templates – the static scaffold is built once; only the card content
+# is substituted per run.
+# ---------------------------------------------------------------------------
+RESEARCH_QUERY_TEMPLATE = """{header}
 
 ==========================================
 CONTENT SOURCES FOR ANALYSIS
 ==========================================
 
 ## 1. PROJECT OVERVIEW (Main Card Content)
-{freeform_text if freeform_text.strip() else "No project overview content available."}
+{freeform}
 
 ## 2. CALL NOTES & CONVERSATIONS  
-{calls_text if calls_text.strip() else "No call notes available."}
+{calls}
 
 ## 3. DUE DILIGENCE QUESTIONNAIRE RESPONSES
-{ddq_text if ddq_text.strip() else "No DDQ responses available."}
+{ddq}
 
 ==========================================
 ANALYSIS INSTRUCTIONS
@@ -467,11 +774,12 @@ Please analyze the above content carefully, ensuring you:
 5. Do not make assumptions about information not explicitly stated
 """
 
-    # Use our OpenRouter client directly instead of web_research deep_research
-    research_prompt = f"""
+_RESEARCH_PROMPT_PREFIX = """
 Please analyze the following Due Diligence Questionnaire and generate comprehensive research insights:
 
-{research_query}
+"""
+
+_RESEARCH_PROMPT_SUFFIX = """
 
 Please provide detailed analysis covering:
 1. Project Overview and Technology
@@ -483,8 +791,26 @@ Please provide detailed analysis covering:
 
 Focus on actionable insights for investment decision making.
 """
-    
-    enhanced_system_prompt = """You are a senior blockchain investment analyst conducting due diligence research. 
+
+# Template split into (literal, field) pieces once, so each run fills in the
+# card content and wraps it in the prefix/suffix with a single join
+_RESEARCH_QUERY_PARTS = tuple(
+    (literal, field) for literal, field, _, _ in string.Formatter().parse(RESEARCH_QUERY_TEMPLATE)
+)
+
+
+def _render_research_prompt(**fields: str) -> str:
+    """Return the full research prompt for the given template fields."""
+    parts = [_RESEARCH_PROMPT_PREFIX]
+    for literal, field in _RESEARCH_QUERY_PARTS:
+        parts.append(literal)
+        if field is not None:
+            parts.append(fields[field])
+    parts.append(_RESEARCH_PROMPT_SUFFIX)
+    return "".join(parts)
+
+
+RESEARCH_SYSTEM_PROMPT = """You are a senior blockchain investment analyst conducting due diligence research. 
 
 CRITICAL ACCURACY REQUIREMENTS:
 - Only use information explicitly stated in the provided content
@@ -495,43 +821,181 @@ CRITICAL ACCURACY REQUIREMENTS:
 
 Provide comprehensive due diligence analysis based strictly on the provided materials."""
 
-    report_md = await client.generate_response(
-        prompt=research_prompt,
-        system_prompt=enhanced_system_prompt,
-        model_override=model
+
+async def _deep_research_runner(
+    page_id: str,
+    ddq_md_path: Path,
+    *,
+    breadth: int = BREADTH,
+    depth: int = DEPTH,
+    concurrency: int = CONCURRENCY,
+) -> Path:
+    """Internal async helper that orchestrates the deep-research run."""
+
+    _logger.info("action=run.start page_id=%s", page_id)
+
+    # ------------------------------------------------------------------
+    # 1. Fetch core Notion content (DDQ + supplementary context) and persist
+    #    the DDQ to disk for traceability.
+    # ------------------------------------------------------------------
+    # The Notion SDK is synchronous: list the card's top level once for this
+    # run, then run the three fetch pipelines in worker threads concurrently.
+    sections = await asyncio.to_thread(_card_sections, _build_notion_client(), page_id)
+    ddq_text, calls_text, freeform_text = await asyncio.gather(
+        # The DDQ is also persisted to disk for audit/debug purposes as it is converted
+        asyncio.to_thread(_write_ddq_markdown, page_id, ddq_md_path, sections),
+        asyncio.to_thread(_fetch_calls_text, page_id, sections),
+        asyncio.to_thread(_fetch_freeform_text, page_id, sections),
     )
+
+    _logger.info("action=content.fetched ddq_bytes=%d calls_bytes=%d freeform_bytes=%d",
+                len(ddq_text), len(calls_text), len(freeform_text))
+
+    # The full DDQ is on disk; the prompt only gets the pruned copy
+    ddq_prompt_text = _prune_ddq(ddq_text)
+    # ~4 characters per token is a good enough estimate for logging
+    _logger.info("action=ddq.pruned chars_before=%d chars_after=%d tokens_saved=%d",
+                len(ddq_text), len(ddq_prompt_text), (len(ddq_text) - len(ddq_prompt_text)) // 4)
     
-    if not report_md:
-        raise RuntimeError("Failed to generate research report")
+    # DEBUG: Log first 500 chars of each content section for debugging
+    _logger.info("action=content.preview ddq_start=%s", ddq_text[:500].replace('\n', '\\n') if ddq_text else "EMPTY")
+    _logger.info("action=content.preview calls_start=%s", calls_text[:500].replace('\n', '\\n') if calls_text else "EMPTY")
+    _logger.info("action=content.preview freeform_start=%s", freeform_text[:500].replace('\n', '\\n') if freeform_text else "EMPTY")
+
+    # ------------------------------------------------------------------
+    # 2. Kick-off deep research
+    # ------------------------------------------------------------------
+    from src.openrouter import OpenRouterClient, StreamIncompleteError
+    client = OpenRouterClient()
+    model = os.getenv("OPENROUTER_PRIMARY_MODEL", "qwen/qwen3-30b-a3b:free")
+
+    # Build the prompt that will be fed into the deep-research agent.
+    header = os.getenv("DEEP_RESEARCH_PROMPT", "Analyze the following project content for investment due diligence:")
+    
+    # Create clearly separated content sections to avoid confusion
+    research_prompt = _render_research_prompt(
+        header=header,
+        freeform=freeform_text if freeform_text.strip() else "No project overview content available.",
+        calls=calls_text if calls_text.strip() else "No call notes available.",
+        ddq=ddq_prompt_text if ddq_prompt_text.strip() else "No DDQ responses available.",
+    )
+
+    # Use our OpenRouter client directly instead of web_research deep_research
+    enhanced_system_prompt = RESEARCH_SYSTEM_PROMPT
 
-    # Use the clean AI response directly (no metadata wrapper)
     reports_dir = Path("reports")
     reports_dir.mkdir(parents=True, exist_ok=True)
     report_path = reports_dir / f"report_{page_id}.md"
-    report_path.write_text(report_md, encoding="utf-8")
-    _logger.info("action=report.saved path=%s bytes=%d", report_path, len(report_md))
+    partial_path = reports_dir / f"report_{page_id}.md.partial"
+
+    def _append_partial(fh: Any, text: str) -> None:
+        fh.write(text)
+        fh.flush()
+
+    async def _stream_report() -> str | None:
+        """Stream the report, appending progress to *partial_path* as it grows.
+
+        Only a stream the provider marked as finished is returned; a cut-off
+        one is discarded (never cached or published) in favour of a buffered call.
+        """
+        chunks: List[str] = []
+        fh = await asyncio.to_thread(partial_path.open, "w", encoding="utf-8")
+        try:
+            flushed = 0
+            async for chunk in client.generate_response_stream(
+                prompt=research_prompt,
+                system_prompt=enhanced_system_prompt,
+                temperature=LLM_TEMPERATURE,
+                model_override=model,
+                max_tokens=LLM_MAX_TOKENS,
+            ):
+                chunks.append(chunk)
+                if len(chunks) - flushed >= 32:
+                    # Only the new tail is written, not the whole report so far
+                    await asyncio.to_thread(_append_partial, fh, "".join(chunks[flushed:]))
+                    flushed = len(chunks)
+        except StreamIncompleteError as e:
+            _logger.warning("action=llm.stream_incomplete page_id=%s chunks=%d error=%s", page_id, len(chunks), e)
+            chunks = []
+        finally:
+            await asyncio.to_thread(fh.close)
+        if chunks:
+            return "".join(chunks)
+
+        # Stream failed or was cut off – the buffered call also tries the fallback model
+        return await client.generate_response(
+            prompt=research_prompt,
+            system_prompt=enhanced_system_prompt,
+            temperature=LLM_TEMPERATURE,
+            model_override=model,
+            max_tokens=LLM_MAX_TOKENS,
+        )
 
     # ------------------------------------------------------------------
     # DEBUG: persist the exact prompt used for the LLM to the reports dir
     # so analysts can easily inspect what went into the model.
     # ------------------------------------------------------------------
+    async def _save_prompt() -> None:
+        try:
+            prompt_path = reports_dir / f"prompt_{page_id}.txt"
+            await asyncio.to_thread(prompt_path.write_text, research_prompt, encoding="utf-8")
+            _logger.info("action=prompt.saved path=%s bytes=%d", prompt_path, len(research_prompt))
+        except Exception as e:  # pragma: no cover – best-effort debug output
+            _logger.warning("action=prompt.save_failed error=%s", e)
+
+    # Best-effort and independent of the report, so it overlaps the LLM call
+    prompt_task = asyncio.create_task(_save_prompt())
+    cleanup_task: asyncio.Task | None = None
     try:
-        prompt_path = reports_dir / f"prompt_{page_id}.txt"
-        prompt_path.write_text(research_query, encoding="utf-8")
-        _logger.info("action=prompt.saved path=%s bytes=%d", prompt_path, len(research_query))
-    except Exception as e:  # pragma: no cover – best-effort debug output
-        _logger.warning("action=prompt.save_failed error=%s", e)
-
-    # ------------------------------------------------------------------
-    # 4. Clean-up scraping resources (e.g. Playwright) to avoid warnings
-    # ------------------------------------------------------------------
-    try:
-        from web_research.data_acquisition.services import search_service  # local import to avoid heavy deps upfront
-
-        if hasattr(search_service, "cleanup"):
-            await search_service.cleanup()
-    except Exception as e:  # pragma: no cover – defensive, log but don't fail
-        _logger.warning("action=cleanup.warning error=%s", e)
+        cache_key = _llm_cache_key(enhanced_system_prompt, research_prompt, model)
+        report_md = await asyncio.to_thread(_read_cached_response, cache_key) if LLM_CACHE_ENABLED else None
+        if report_md:
+            _logger.info("action=llm_cache.hit page_id=%s key=%s", page_id, cache_key)
+        else:
+            # generate_response returns None on provider errors; treat that like a
+            # timeout and retry a bounded number of times.
+            async for attempt in AsyncRetrying(
+                wait=wait_exponential(multiplier=1, min=2, max=10),
+                stop=stop_after_attempt(LLM_MAX_ATTEMPTS),
+                retry=retry_if_exception_type((asyncio.TimeoutError, RuntimeError)),
+                reraise=True,
+            ):
+                with attempt:
+                    report_md = await asyncio.wait_for(_stream_report(), timeout=LLM_TIMEOUT)
+                    if not report_md:
+                        raise RuntimeError("Failed to generate research report")
+
+            if LLM_CACHE_ENABLED:
+                await asyncio.to_thread(
+                    _write_cached_response, cache_key, report_md, model=model, prompt=research_prompt
+                )
+
+        # ------------------------------------------------------------------
+        # 4. Clean-up scraping resources (e.g. Playwright) to avoid warnings.
+        #    Teardown is independent of the report, so it overlaps the writes.
+        # ------------------------------------------------------------------
+        async def _safe_cleanup() -> None:
+            try:
+                from web_research.data_acquisition.services import search_service  # local import to avoid heavy deps upfront
+
+                if hasattr(search_service, "cleanup"):
+                    await search_service.cleanup()
+            except Exception as e:  # pragma: no cover – defensive, log but don't fail
+                _logger.warning("action=cleanup.warning error=%s", e)
+
+        cleanup_task = asyncio.create_task(_safe_cleanup())
+
+        # Use the clean AI response directly (no metadata wrapper)
+        # File writes run in worker threads so concurrent research runs sharing
+        # the event loop are not stalled by disk I/O
+        await asyncio.to_thread(report_path.write_text, report_md, encoding="utf-8")
+        await asyncio.to_thread(partial_path.unlink, missing_ok=True)
+        _logger.info("action=report.saved path=%s bytes=%d", report_path, len(report_md))
+    finally:
+        # The prompt file is written while the model is generating.  Both
+        # helpers swallow their own errors, so awaiting them here (also when
+        # the report failed) never masks the runner's exception.
+        await asyncio.gather(*(t for t in (prompt_task, cleanup_task) if t is not None))
 
     return report_path
 
@@ -540,6 +1004,44 @@ Provide comprehensive due diligence analysis based strictly on the provided mate
 # Public API
 # ---------------------------------------------------------------------------
 
+async def run_deep_research_async(page_id: str, ddq_md_path: Path | str) -> Path:
+    """Async variant of :func:`run_deep_research` for callers with a running loop.
+
+    Several cards can be researched concurrently, e.g.
+    ``await asyncio.gather(*(run_deep_research_async(pid, p) for pid, p in cards))``.
+    Parameters, return value and errors are the same as for
+    :func:`run_deep_research`.
+    """
+
+    try:
+        return await _deep_research_runner(page_id, Path(ddq_md_path))
+    except Exception as exc:
+        _logger.exception("action=run.error page_id=%s", page_id)
+        raise RuntimeError("Deep research failed") from exc
+
+
+async def run_deep_research_many(
+    page_ids: List[str],
+    ddq_dir: Path | str,
+    *,
+    max_concurrent: int = CARD_CONCURRENCY,
+) -> List[Path | BaseException]:
+    """Research several cards concurrently on one event loop.
+
+    Each card's DDQ is written to ``ddq_dir / f"research_{page_id}.md"``.
+    Results are returned in the order of *page_ids*; a card that fails
+    yields its ``RuntimeError`` instead of aborting the whole batch.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def _run_one(page_id: str) -> Path:
+        async with semaphore:
+            return await run_deep_research_async(page_id, Path(ddq_dir) / f"research_{page_id}.md")
+
+    return await asyncio.gather(*(_run_one(pid) for pid in page_ids), return_exceptions=True)
+
+
 def run_deep_research(page_id: str, ddq_md_path: Path | str) -> Path:
     """High-level wrapper to execute deep research synchronously.
 
@@ -562,13 +1064,10 @@ def run_deep_research(page_id: str, ddq_md_path: Path | str) -> Path:
         If any step fails (HTTP errors, OpenAI issues, etc.).
     """
 
-    try:
-        path_obj = Path(ddq_md_path)
-        report_path = asyncio.run(_deep_research_runner(page_id, path_obj))
-        return report_path
-    except Exception as exc:
-        _logger.exception("action=run.error page_id=%s", page_id)
-        raise RuntimeError("Deep research failed") from exc
+    return asyncio.run(run_deep_research_async(page_id, ddq_md_path))
 
 
+def run_deep_research_batch(page_ids: List[str], ddq_dir: Path | str) -> List[Path | BaseException]:
+    """Synchronous wrapper around :func:`run_deep_research_many`."""
 
+    return asyncio.run(run_deep_research_many(page_ids, ddq_dir))
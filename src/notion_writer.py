@@ -23,6 +23,7 @@ import os
 import pathlib
 from typing import List, Dict, Any, cast, Iterable
 import re
+from operator import itemgetter
 
 import httpx
 from notion_client import Client as NotionClient
@@ -30,7 +31,11 @@ from notion_client.errors import RequestTimeoutError
 from notion_client import APIResponseError
 from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
 
-__all__ = ["publish_report"]
+__all__ = ["publish_report", "page_id_and_url"]
+
+# Extracts (id, url) from a pages.create response in a single C-level call;
+# shared with the scoring page upload in src/pages/notion_automation.py
+page_id_and_url = itemgetter("id", "url")
 
 # ---------------------------------------------------------------------------
 # Logging setup
@@ -471,6 +476,9 @@ def publish_report(page_id: str, report_path: Path, username: str = None) -> str
     md = _strip_duplicate_sources(report_path.read_text(encoding="utf-8"))
     blocks = _md_to_blocks(md)
 
+    # Bind hot-path SDK methods once – the batch loops below call them per chunk.
+    append_children = client.blocks.children.append
+
     if report_page_id is None:
         # ------------------------------------------------------------------
         # 2a. Create new child page
@@ -491,13 +499,12 @@ def publish_report(page_id: str, report_path: Path, username: str = None) -> str
                     icon={"emoji": "🤖"},
                     children=first_batch,
                 )
-        report_page_id = cast(str, new_page["id"])
-        report_url = cast(str, new_page["url"])
+        report_page_id, report_url = page_id_and_url(new_page)
         # Append remaining batches (if any)
         for batch in _chunks(blocks[100:]):
             for attempt in _tenacity():
                 with attempt:
-                    client.blocks.children.append(block_id=report_page_id, children=batch)
+                    append_children(block_id=report_page_id, children=batch)
         _logger.info("action=writer.created page_id=%s", report_page_id)
     else:
         # ------------------------------------------------------------------
@@ -510,16 +517,17 @@ def publish_report(page_id: str, report_path: Path, username: str = None) -> str
             with attempt:
                 existing_children = client.blocks.children.list(block_id=report_page_id, page_size=100)
         # Delete in reverse order to respect list indices
+        delete_block = client.blocks.delete
         for blk in reversed(existing_children.get("results", [])):
             try:
-                client.blocks.delete(block_id=blk["id"])
+                delete_block(block_id=blk["id"])
             except Exception:  # best-effort
                 pass
         # Append fresh content respecting 100-block limit
         for batch in _chunks(blocks):
             for attempt in _tenacity():
                 with attempt:
-                    client.blocks.children.append(block_id=report_page_id, children=batch)
+                    append_children(block_id=report_page_id, children=batch)
         report_url = f"https://www.notion.so/{report_page_id.replace('-', '')}"
         _logger.info("action=writer.updated page_id=%s", report_page_id)
 
@@ -2,7 +2,7 @@ import os
 import json
 import aiohttp
 from aiohttp import ClientTimeout
-from typing import Dict, Any, Optional, List, TypedDict
+from typing import AsyncIterator, Dict, Any, Optional, List, TypedDict
 import asyncio
 import ssl
 import certifi
@@ -20,6 +20,10 @@ class ResearchResult(TypedDict):
     learnings: List[str]
     visited_urls: List[str]
 
+class StreamIncompleteError(Exception):
+    """Raised when a streamed response fails or ends before the provider signals completion."""
+    pass
+
 class OpenRouterClient:
     def __init__(self):
         # OpenRouter configuration
@@ -82,7 +86,35 @@ class OpenRouterClient:
                 "provider": "openrouter"
             }
 
-    async def _make_request(self, model: str, messages: list, temperature: float = 0.7) -> Optional[Dict[str, Any]]:
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        """Create a TCP connector with proper certificate verification."""
+        try:
+            ssl_context = ssl.create_default_context(cafile=certifi.where())
+            return aiohttp.TCPConnector(ssl=ssl_context)
+        except Exception as ssl_error:
+            print(f"SSL context creation failed, using relaxed SSL verification: {ssl_error}")
+            # Fallback: Create SSL context with relaxed verification for development
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+            return aiohttp.TCPConnector(ssl=ssl_context)
+
+    @staticmethod
+    def _request_timeout(provider_model: str) -> ClientTimeout:
+        """Dynamic timeout based on model - dmind models need more time for thinking."""
+        if "dmind" in provider_model.lower():
+            print(f"Using extended timeout (600s) for dmind model: {provider_model}")
+            return ClientTimeout(total=600)  # 10 minutes for dmind models
+        return ClientTimeout(total=300)  # 5 minutes for other models
+
+    @classmethod
+    def _stream_timeout(cls, provider_model: str) -> ClientTimeout:
+        """Streams can legitimately run longer than a buffered call, so only the
+        wait between chunks is bounded (by the model's usual request timeout)."""
+        return ClientTimeout(total=None, sock_read=cls._request_timeout(provider_model).total)
+
+    async def _make_request(self, model: str, messages: list, temperature: float = 0.7,
+                            max_tokens: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """Make an asynchronous request to the appropriate API provider."""
         provider_config = self._get_provider_config(model)
         if provider_config is None:
@@ -96,25 +128,12 @@ class OpenRouterClient:
             "messages": messages,
             "temperature": temperature
         }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
         
-        # Dynamic timeout based on model - dmind models need more time for thinking
-        if "dmind" in provider_config["model"].lower():
-            request_timeout = ClientTimeout(total=600)  # 10 minutes for dmind models
-            print(f"Using extended timeout (600s) for dmind model: {provider_config['model']}")
-        else:
-            request_timeout = ClientTimeout(total=300)  # 5 minutes for other models
+        request_timeout = self._request_timeout(provider_config["model"])
 
-        # Create SSL context with proper certificate verification
-        try:
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-        except Exception as ssl_error:
-            print(f"SSL context creation failed, using relaxed SSL verification: {ssl_error}")
-            # Fallback: Create SSL context with relaxed verification for development
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
+        connector = self._create_connector()
 
         async with aiohttp.ClientSession(headers=provider_config["headers"], connector=connector) as session:
             # Retry logic for 503 Service Unavailable errors
@@ -153,9 +172,11 @@ class OpenRouterClient:
                          prompt: str, 
                          system_prompt: Optional[str] = None,
                          temperature: float = 0.7,
-                         model_override: Optional[str] = None) -> Optional[str]:
+                         model_override: Optional[str] = None,
+                         max_tokens: Optional[int] = None) -> Optional[str]:
         """Generate a response using the OpenRouter API with fallback, asynchronously.
         If model_override is provided, it uses that model directly, skipping primary/fallback.
+        max_tokens caps the completion length when given.
         """
         messages = []
         system_prompt_to_use = system_prompt or SYSTEM_PROMPT
@@ -168,22 +189,22 @@ class OpenRouterClient:
             # Use the specified override model with fallback
             provider_config = self._get_provider_config(model_override)
             print(f"Using model override: {model_override} via {provider_config['provider']}")
-            response_data = await self._make_request(model_override, messages, temperature)
+            response_data = await self._make_request(model_override, messages, temperature, max_tokens)
             
             # If override model fails, try fallback
             if not response_data and model_override != "qwen/qwen3-30b-a3b:free":
                 print(f"Model {model_override} failed, falling back to qwen/qwen3-30b-a3b:free")
-                response_data = await self._make_request("qwen/qwen3-30b-a3b:free", messages, temperature)
+                response_data = await self._make_request("qwen/qwen3-30b-a3b:free", messages, temperature, max_tokens)
         else:
             # Use primary model with fallback logic
             provider_config = self._get_provider_config(self.primary_model)
             print(f"Using primary model: {self.primary_model} via {provider_config['provider']}")
-            response_data = await self._make_request(self.primary_model, messages, temperature)
+            response_data = await self._make_request(self.primary_model, messages, temperature, max_tokens)
             
             # If primary model fails, try fallback
             if not response_data and self.primary_model != "qwen/qwen3-30b-a3b:free":
                 print(f"Primary model {self.primary_model} failed, falling back to qwen/qwen3-30b-a3b:free")
-                response_data = await self._make_request("qwen/qwen3-30b-a3b:free", messages, temperature)
+                response_data = await self._make_request("qwen/qwen3-30b-a3b:free", messages, temperature, max_tokens)
         
         # Process the response (regardless of which model was used)
         if response_data and "choices" in response_data and response_data["choices"]:
@@ -195,6 +216,82 @@ class OpenRouterClient:
         
         return None
 
+    async def generate_response_stream(self,
+                                       prompt: str,
+                                       system_prompt: Optional[str] = None,
+                                       temperature: float = 0.7,
+                                       model_override: Optional[str] = None,
+                                       max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Stream a response as content deltas using server-sent events, asynchronously.
+
+        Raises StreamIncompleteError if the request fails or the stream ends
+        without a ``[DONE]``/``finish_reason``, so callers never mistake a
+        cut-off response for a complete one and can fall back to generate_response.
+        """
+        model = model_override or self.primary_model
+        provider_config = self._get_provider_config(model)
+        if provider_config is None:
+            print(f"Cannot get provider config for model {model}")
+            return
+
+        messages = [
+            {"role": "system", "content": system_prompt or SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        url = f"{provider_config['base_url']}/chat/completions"
+        payload = {
+            "model": provider_config["model"],
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True
+        }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        request_timeout = self._stream_timeout(provider_config["model"])
+
+        finished = False
+        async with aiohttp.ClientSession(headers=provider_config["headers"], connector=self._create_connector()) as session:
+            try:
+                async with session.post(url, json=payload, timeout=request_timeout) as response:
+                    response.raise_for_status()
+
+                    # SSE lines look like "data: {...}"; lines starting with ":" are keep-alive comments
+                    async for raw_line in response.content:
+                        line = raw_line.decode("utf-8").strip()
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            finished = True
+                            break
+                        try:
+                            chunk = json.loads(data)
+                        except json.JSONDecodeError:
+                            continue
+                        choices = chunk.get("choices") or []
+                        delta = choices[0].get("delta", {}).get("content") if choices else None
+                        if delta:
+                            yield delta
+                        if choices and choices[0].get("finish_reason"):
+                            finished = True
+            except asyncio.TimeoutError as e:
+                message = f"Stream timed out while reading from {provider_config['provider']} API with {model}"
+                print(message)
+                raise StreamIncompleteError(message) from e
+            except aiohttp.ClientResponseError as e:
+                message = f"HTTP Error streaming from {provider_config['provider']} API with {model}: Status {e.status}, Message: {e.message}"
+                print(message)
+                raise StreamIncompleteError(message) from e
+            except aiohttp.ClientError as e:
+                message = f"Client Error streaming from {provider_config['provider']} API with {model}: {e}"
+                print(message)
+                raise StreamIncompleteError(message) from e
+
+        if not finished:
+            message = f"Stream from {provider_config['provider']} API with {model} ended before completion"
+            print(message)
+            raise StreamIncompleteError(message)
+
     async def analyze_ddq(self, ddq_content: str, system_prompt: str) -> Optional[str]:
         """Analyze a DDQ document and generate a research report, asynchronously."""
         structure_prompt = f"""Please analyze the following DDQ document and identify its structure and key sections:
@@ -1,40 +1,276 @@
 import streamlit as st
 import asyncio
+import threading
+import time
+import traceback
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
+from src.audit_logger import get_audit_logger
 from src.pages.base_page import BasePage
 from src.controllers.voice_cloner_controller import VoiceClonerController, VoiceClonerInput
 from src.config import OPENROUTER_PRIMARY_MODEL
 
+# Hard limit for a single voice cloning job (10 minutes)
+VOICE_CLONER_TIMEOUT_SECONDS = 600
+
+# First matching keyword in a ValueError message selects the tip shown to the user
+_ERROR_TIPS = (
+    ("too short", "💡 **Tip:** Try providing longer writing examples (at least 20 characters each) and text to reformat (at least 10 characters)."),
+    ("too long", "💡 **Tip:** Try shortening your text. Consider breaking very long texts into smaller sections."),
+    ("empty", "💡 **Tip:** Make sure all writing examples and the text to reformat are filled in."),
+    ("api key", "💡 **Tip:** Please contact the administrator - the AI service is not properly configured."),
+    ("rate limit", "💡 **Tip:** Please wait a few minutes and try again. The AI service has temporary usage limits."),
+    ("timeout", "💡 **Tip:** Try using a different AI model or shorter text. Some models may be slower than others."),
+    ("unavailable", "💡 **Tip:** The AI service is temporarily down. Please try again in a few minutes."),
+    ("event loop", "💡 **Tip:** There was an async processing issue. Please try again - this is usually temporary."),
+    ("asyncio", "💡 **Tip:** There was an async processing issue. Please try again - this is usually temporary."),
+)
+
+# Feedback is recorded in the background; two workers are plenty for button clicks
+_FEEDBACK_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="voice-cloner-feedback")
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the long-lived event loop that runs voice cloning jobs.
+
+    The loop lives on a daemon thread so the Streamlit script thread is never
+    blocked by the LLM calls; jobs are submitted with
+    ``asyncio.run_coroutine_threadsafe`` and polled from a fragment.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="voice-cloner-loop", daemon=True).start()
+            _background_loop = loop
+    return _background_loop
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_model_choices() -> tuple[list[str], list[str], int]:
+    """Return model keys, display labels and the default index for the model selectbox.
+
+    Cached so the catalog lookup and ``.index()`` search are not repeated on
+    every rerun.
+    """
+    available_models = VoiceClonerController.get_available_models()
+    
+    # Create model selection
+    model_options = list(available_models.keys())
+    model_labels = [available_models[key] for key in model_options]
+    
+    # Find default model index
+    default_index = 0
+    if OPENROUTER_PRIMARY_MODEL in model_options:
+        default_index = model_options.index(OPENROUTER_PRIMARY_MODEL)
+    
+    return model_options, model_labels, default_index
+
+
+@st.fragment
+def _writing_example_input(index: int) -> None:
+    """Render one writing example text area with its live length check."""
+    example_text = st.text_area(
+        f"Writing Example {index}",
+        height=150,
+        placeholder=f"Paste your {['first', 'second', 'third'][index - 1]} writing example here...",
+        key=f"writing_example_{index}",
+        help=f"Example {index}: Write in your natural style. Min 20 characters."
+    )
+    
+    # Real-time character count and validation
+    char_count = len(example_text.strip()) if example_text else 0
+    if char_count > 0:
+        if char_count < 20:
+            st.error(f"⚠️ Too short ({char_count}/20 min)")
+        elif char_count > 10000:
+            st.error(f"⚠️ Too long ({char_count}/10,000 max)")
+        else:
+            st.success(f"✅ Good length ({char_count} chars)")
+    else:
+        st.info("Enter your writing example")
+
+
+@st.fragment
+def _new_piece_input() -> None:
+    """Render the text-to-reformat area with its live length check."""
+    new_piece_to_create = st.text_area(
+        "Paste the text you want to reformat in your voice style:",
+        height=150,
+        placeholder="Paste your existing text here. The AI will reformat it to match your voice style and make it sound more human-like...",
+        key="new_piece_to_create",
+        help="The text you want to transform using your writing style. Min 10 characters, max 50,000."
+    )
+    
+    # Real-time validation for input text
+    input_char_count = len(new_piece_to_create.strip()) if new_piece_to_create else 0
+    if input_char_count > 0:
+        if input_char_count < 10:
+            st.error(f"⚠️ Text too short ({input_char_count}/10 min)")
+        elif input_char_count > 50000:
+            st.error(f"⚠️ Text too long ({input_char_count}/50,000 max)")
+            st.warning("💡 Consider breaking long texts into smaller sections for better results.")
+        else:
+            # Estimate processing time
+            estimated_time = max(30, input_char_count / 50)  # Rough estimate
+            if input_char_count > 5000:
+                st.info(f"📊 Large text detected ({input_char_count:,} chars). Estimated processing: {estimated_time:.0f}s. Will use chunked processing.")
+            else:
+                st.success(f"✅ Good length ({input_char_count:,} chars). Estimated processing: {estimated_time:.0f}s")
+    else:
+        st.info("Enter the text you want to reformat")
+
+
+def _confidence_badge(confidence: int) -> tuple[str, tuple[str, str]]:
+    """Return the metric help text and (status level, badge) for a confidence score."""
+    if confidence >= 80:
+        return "High confidence - excellent voice match", ("success", "🎯 Excellent Match")
+    if confidence >= 60:
+        return "Good confidence - solid voice match", ("info", "👍 Good Match")
+    return "Lower confidence - consider providing more diverse writing examples", ("warning", "⚠️ Fair Match")
+
+
+def _processing_time_badge(processing_time: float) -> tuple[str, str]:
+    """Return the (status level, badge) for a processing time in seconds."""
+    if processing_time < 30:
+        return "success", "⚡ Fast"
+    if processing_time < 120:
+        return "info", "⏱️ Normal"
+    return "warning", "🐌 Slow"
+
+
+def _post_feedback(satisfaction: str, feedback_text: str, user: str, role: str, model: str) -> None:
+    """Record a user's rating of a voice cloning result in the audit log."""
+    try:
+        get_audit_logger(
+            user=user,
+            role=role,
+            action="VOICE_CLONER_FEEDBACK",
+            details=f"Satisfaction: {satisfaction}, Comments: {feedback_text or 'None'}",
+            model=model
+        )
+    except Exception as log_error:
+        print(f"Warning: Failed to record feedback: {log_error}")
+
+
 class VoiceClonerPage(BasePage):
     """Voice Cloner page for AI-powered voice style cloning."""
     
     def __init__(self):
         super().__init__("Voice Cloner", "🎙️ Voice Cloner")
-        self.controller = VoiceClonerController()
+    
+    @cached_property
+    def controller(self) -> VoiceClonerController:
+        """Voice cloner controller, built on first use rather than on every page construction."""
+        return VoiceClonerController()
     
     def get_current_user(self) -> str:
         """Get the current authenticated user."""
         return st.session_state.get('username', 'anonymous')
     
     def _process_pending_request(self):
-        """Process a pending voice cloning request."""
+        """Dispatch a pending voice cloning request to the background event loop."""
         if 'voice_cloner_request' not in st.session_state:
             return
             
         request = st.session_state.voice_cloner_request
         
-        # Process the request synchronously
-        self._process_voice_cloning_sync(
-            request['writing_example_1'],
-            request['writing_example_2'], 
-            request['writing_example_3'],
-            request['new_piece_to_create'],
-            request['selected_model']
-        )
-        
         # Clean up the request
         del st.session_state.voice_cloner_request
+        
+        # Single-flight: skip requests already dispatched or superseded by a running job
+        if (st.session_state.get('voice_cloner_dispatched_id') == request['request_id']
+                or st.session_state.get('voice_cloner_future') is not None):
+            return
+        st.session_state.voice_cloner_dispatched_id = request['request_id']
+        
+        try:
+            input_data = VoiceClonerInput(
+                writing_example_1=request['writing_example_1'],
+                writing_example_2=request['writing_example_2'],
+                writing_example_3=request['writing_example_3'],
+                new_piece_to_create=request['new_piece_to_create'],
+                model=request['selected_model'],
+                username=self.get_current_user(),
+                session_id=st.session_state.get('session_id', 'default'),
+                batch_size=request['batch_size']
+            )
+        except Exception as e:
+            self._handle_processing_error(e)
+            return
+        
+        # Plain dict the background loop writes into and the status fragment reads;
+        # session state itself must not be touched from outside the script thread
+        progress = {'status': '', 'text': ''}
+        
+        async def report_status(message: str) -> None:
+            progress['status'] = message
+        
+        def report_text(text: str) -> None:
+            progress['text'] = text
+        
+        # process_with_streaming chunks large inputs and refines the chunks concurrently
+        job = asyncio.wait_for(
+            self.controller.process_with_streaming(input_data, callback=report_status, on_text=report_text),
+            timeout=VOICE_CLONER_TIMEOUT_SECONDS
+        )
+        st.session_state.voice_cloner_progress = progress
+        st.session_state.voice_cloner_future = asyncio.run_coroutine_threadsafe(job, _get_background_loop())
+        st.session_state.voice_cloner_started_at = time.time()
+        st.session_state.last_model_used = request['selected_model']
+        st.session_state.last_input_length = len(request['new_piece_to_create'])
+        st.session_state.last_batch_size = request['batch_size']
+    
+    @st.fragment(run_every=1.0)
+    def _status_fragment(self):
+        """Poll the background voice cloning job without rerunning the whole page."""
+        future = st.session_state.get('voice_cloner_future')
+        if future is None:
+            st.session_state.voice_cloner_processing = False
+            return
+        
+        if future.done():
+            self._clear_job()
+            self._collect_result(future)
+            return
+        
+        elapsed = time.time() - st.session_state.get('voice_cloner_started_at', time.time())
+        st.info(f"🔄 Reformatting text... The AI is performing 50+ internal refinement iterations. ({elapsed:.0f}s elapsed)")
+        st.info("The AI is analyzing your writing style and reformatting your text to match your voice while making it more human-like.")
+        st.warning("⏱️ This process may take 5-10 minutes depending on the model and text length. Please be patient!")
+        
+        progress = st.session_state.get('voice_cloner_progress', {})
+        if progress.get('status'):
+            st.caption(progress['status'])
+        if progress.get('text'):
+            with st.expander("👀 Live model output", expanded=True):
+                st.markdown(progress['text'])
+        
+        # Cancel button
+        if st.button("🛑 Cancel Processing", key="voice_cloner_cancel_btn"):
+            future.cancel()
+            self._clear_job()
+            st.session_state.voice_cloner_processing = False
+            self._queue_message("warning", "Processing cancelled. You can try again with a different model or shorter text.")
+            st.rerun()
+    
+    def _clear_job(self) -> None:
+        """Forget the background job and its partial output once it is finished or cancelled."""
+        st.session_state.pop('voice_cloner_future', None)
+        st.session_state.pop('voice_cloner_progress', None)
+    
+    def _init_session_state(self) -> None:
+        """Initialize required session state keys."""
+        required_keys = {
+            'voice_cloner_result': None,
+            'voice_cloner_processing': False,
+        }
+        self.init_session_state(required_keys)
     
     async def render(self):
         """Render the voice cloner page."""
@@ -45,13 +281,11 @@ class VoiceClonerPage(BasePage):
         self.show_page_header("🎙️ Voice Cloner", "AI-powered text reformatting to match your voice style")
         
         # Initialize session state
-        if 'voice_cloner_result' not in st.session_state:
-            st.session_state.voice_cloner_result = None
-        if 'voice_cloner_processing' not in st.session_state:
-            st.session_state.voice_cloner_processing = False
+        self._init_session_state()
         
-        # Enhanced main form with better UX
-        with st.form("voice_cloner_form"):
+        # Enhanced main input area with better UX. Not an st.form: each text
+        # area lives in its own fragment so typing only reruns its validator.
+        with st.container(border=True):
             # Progress indicator
             progress_container = st.container()
             
@@ -68,72 +302,21 @@ class VoiceClonerPage(BasePage):
             
             # Character count tracking for examples
             example_cols = st.columns(3)
-            examples_data = []
             
             for i, col in enumerate(example_cols):
                 with col:
-                    example_text = st.text_area(
-                        f"Writing Example {i+1}",
-                        height=150,
-                        placeholder=f"Paste your {['first', 'second', 'third'][i]} writing example here...",
-                        key=f"writing_example_{i+1}",
-                        help=f"Example {i+1}: Write in your natural style. Min 20 characters."
-                    )
-                    
-                    # Real-time character count and validation
-                    char_count = len(example_text.strip()) if example_text else 0
-                    if char_count > 0:
-                        if char_count < 20:
-                            st.error(f"⚠️ Too short ({char_count}/20 min)")
-                        elif char_count > 10000:
-                            st.error(f"⚠️ Too long ({char_count}/10,000 max)")
-                        else:
-                            st.success(f"✅ Good length ({char_count} chars)")
-                    else:
-                        st.info("Enter your writing example")
-                    
-                    examples_data.append(example_text)
+                    _writing_example_input(i + 1)
             
-            writing_example_1, writing_example_2, writing_example_3 = examples_data
-            
-            st.subheader("✍️ Text to Reformat")
-            new_piece_to_create = st.text_area(
-                "Paste the text you want to reformat in your voice style:",
-                height=150,
-                placeholder="Paste your existing text here. The AI will reformat it to match your voice style and make it sound more human-like...",
-                key="new_piece_to_create",
-                help="The text you want to transform using your writing style. Min 10 characters, max 50,000."
+            writing_example_1, writing_example_2, writing_example_3 = (
+                st.session_state.get(f"writing_example_{i}", "") for i in range(1, 4)
             )
             
-            # Real-time validation for input text
-            input_char_count = len(new_piece_to_create.strip()) if new_piece_to_create else 0
-            if input_char_count > 0:
-                if input_char_count < 10:
-                    st.error(f"⚠️ Text too short ({input_char_count}/10 min)")
-                elif input_char_count > 50000:
-                    st.error(f"⚠️ Text too long ({input_char_count}/50,000 max)")
-                    st.warning("💡 Consider breaking long texts into smaller sections for better results.")
-                else:
-                    # Estimate processing time
-                    estimated_time = max(30, input_char_count / 50)  # Rough estimate
-                    if input_char_count > 5000:
-                        st.info(f"📊 Large text detected ({input_char_count:,} chars). Estimated processing: {estimated_time:.0f}s. Will use chunked processing.")
-                    else:
-                        st.success(f"✅ Good length ({input_char_count:,} chars). Estimated processing: {estimated_time:.0f}s")
-            else:
-                st.info("Enter the text you want to reformat")
+            st.subheader("✍️ Text to Reformat")
+            _new_piece_input()
+            new_piece_to_create = st.session_state.get("new_piece_to_create", "")
             
             st.subheader("🤖 AI Model Selection")
-            available_models = self.controller.get_available_models()
-            
-            # Create model selection
-            model_options = list(available_models.keys())
-            model_labels = [available_models[key] for key in model_options]
-            
-            # Find default model index
-            default_index = 0
-            if OPENROUTER_PRIMARY_MODEL in model_options:
-                default_index = model_options.index(OPENROUTER_PRIMARY_MODEL)
+            model_options, model_labels, default_index = _cached_model_choices()
             
             selected_model_label = st.selectbox(
                 "Select AI Model:",
@@ -156,7 +339,7 @@ class VoiceClonerPage(BasePage):
                 **Keyboard Shortcuts:**
                 - `Tab` - Navigate between form fields
                 - `Shift + Tab` - Navigate backwards
-                - `Enter` - Submit form (when focused on submit button)
+                - `Enter` - Start reformatting (when focused on the submit button)
                 - `Ctrl + A` (Cmd + A on Mac) - Select all text in active field
                 - `Escape` - Clear focus from current field
                 
@@ -169,10 +352,10 @@ class VoiceClonerPage(BasePage):
                 """)
             
             # Submit button with enhanced accessibility
-            submitted = st.form_submit_button(
+            submitted = st.button(
                 "🎯 Reformat Text",
                 disabled=st.session_state.voice_cloner_processing,
-                help="Press Enter to submit the form or click this button to start voice cloning",
+                help="Click this button to start voice cloning",
                 use_container_width=True
             )
             
@@ -191,13 +374,17 @@ class VoiceClonerPage(BasePage):
                 ]
                 
                 for name, example in examples:
-                    if example and len(example.strip()) < 20:
+                    if not example:
+                        continue
+                    example_length = len(example.strip())
+                    if example_length < 20:
                         validation_errors.append(f"{name} is too short (minimum 20 characters)")
-                    elif example and len(example.strip()) > 10000:
+                    elif example_length > 10000:
                         validation_errors.append(f"{name} is too long (maximum 10,000 characters)")
                 
+                # Strip the (up to 50KB) input once and reuse the length below
+                text_length = len(new_piece_to_create.strip()) if new_piece_to_create else 0
                 if new_piece_to_create:
-                    text_length = len(new_piece_to_create.strip())
                     if text_length < 10:
                         validation_errors.append("Text to reformat is too short (minimum 10 characters)")
                     elif text_length > 50000:
@@ -207,13 +394,23 @@ class VoiceClonerPage(BasePage):
                     for error in validation_errors:
                         st.error(f"❌ {error}")
                 else:
+                    # Large inputs are split into ~4,000 char chunks; refine up to
+                    # batch_size of them concurrently.
+                    batch_size = min(16, max(2, text_length // 4000))
+                    
+                    # Monotonic token so a double-click cannot dispatch the same request twice
+                    request_id = st.session_state.get('voice_cloner_request_id', 0) + 1
+                    st.session_state.voice_cloner_request_id = request_id
+                    
                     # Store the request in session state and trigger processing
                     st.session_state.voice_cloner_request = {
+                        'request_id': request_id,
                         'writing_example_1': writing_example_1,
                         'writing_example_2': writing_example_2,
                         'writing_example_3': writing_example_3,
                         'new_piece_to_create': new_piece_to_create,
-                        'selected_model': selected_model
+                        'selected_model': selected_model,
+                        'batch_size': batch_size
                     }
                     st.session_state.voice_cloner_processing = True
                     st.info("⏳ Processing started! Please have patience - this may take several minutes depending on your text length and the selected AI model.")
@@ -223,224 +420,109 @@ class VoiceClonerPage(BasePage):
         if st.session_state.voice_cloner_processing and 'voice_cloner_request' in st.session_state:
             self._process_pending_request()
         
+        # Messages from the last finished/cancelled/failed job
+        self._show_queued_messages()
+        
         # Show processing status
         if st.session_state.voice_cloner_processing:
-            with st.spinner("🔄 Reformatting text... The AI is performing 50+ internal refinement iterations."):
-                st.info("The AI is analyzing your writing style and reformatting your text to match your voice while making it more human-like.")
-                st.warning("⏱️ This process may take 5-10 minutes depending on the model and text length. Please be patient!")
-                
-                # Cancel button
-                if st.button("🛑 Cancel Processing"):
-                    st.session_state.voice_cloner_processing = False
-                    if 'voice_cloner_request' in st.session_state:
-                        del st.session_state.voice_cloner_request
-                    st.warning("Processing cancelled. You can try again with a different model or shorter text.")
-                    st.rerun()
+            self._status_fragment()
         
         # Show results
         if st.session_state.voice_cloner_result:
-            await self._display_results()
+            self._display_results()
     
-    async def _process_voice_cloning(self, example1: str, example2: str, example3: str, new_piece: str, model: str):
-        """Process the voice cloning request."""
+    def _collect_result(self, future):
+        """Store the outcome of a finished background job and refresh the page once."""
+        st.session_state.voice_cloner_processing = False
         try:
-            st.session_state.voice_cloner_processing = True
-            st.rerun()
-            
-            # Create input model
-            input_data = VoiceClonerInput(
-                writing_example_1=example1,
-                writing_example_2=example2,
-                writing_example_3=example3,
-                new_piece_to_create=new_piece,
-                model=model,
-                username=self.get_current_user(),
-                session_id=st.session_state.get('session_id', 'default')
-            )
-            
-            # Add timeout wrapper
-            import asyncio
-            try:
-                # Set timeout to 10 minutes (600 seconds)
-                result = await asyncio.wait_for(
-                    self.controller.process_voice_cloning(input_data), 
-                    timeout=600
-                )
-                
-                # Store result
-                st.session_state.voice_cloner_result = result
-                st.session_state.voice_cloner_processing = False
-                
-                # Log the activity
-                from src.audit_logger import get_audit_logger
-                get_audit_logger(
-                    user=self.get_current_user(),
-                    role=st.session_state.get('role', 'N/A'),
-                    action="VOICE_CLONER_REQUEST",
-                    details=f"Model: {model}, Confidence: {result.confidence_score}%, Iterations: {result.iterations_completed}, Time: {result.processing_time:.1f}s"
-                )
-                
-                st.success("✅ Text reformatting completed successfully!")
-                st.rerun()
-                
-            except asyncio.TimeoutError:
-                st.session_state.voice_cloner_processing = False
-                st.error("⏱️ Request timed out after 10 minutes. Please try with a shorter text or different model.")
-                st.rerun()
-            
-        except ValueError as ve:
-            # Handle user-friendly validation errors
-            st.session_state.voice_cloner_processing = False
-            st.error(f"❌ {str(ve)}")
-            
-            # Provide helpful suggestions based on error type
-            error_msg = str(ve).lower()
-            if "too short" in error_msg:
-                st.info("💡 **Tip:** Try providing longer writing examples (at least 20 characters each) and text to reformat (at least 10 characters).")
-            elif "too long" in error_msg:
-                st.info("💡 **Tip:** Try shortening your text. Consider breaking very long texts into smaller sections.")
-            elif "empty" in error_msg:
-                st.info("💡 **Tip:** Make sure all writing examples and the text to reformat are filled in.")
-            elif "api key" in error_msg:
-                st.info("💡 **Tip:** Please contact the administrator - the AI service is not properly configured.")
-            elif "rate limit" in error_msg:
-                st.info("💡 **Tip:** Please wait a few minutes and try again. The AI service has temporary usage limits.")
-            elif "timeout" in error_msg:
-                st.info("💡 **Tip:** Try using a different AI model or shorter text. Some models may be slower than others.")
-            elif "unavailable" in error_msg:
-                st.info("💡 **Tip:** The AI service is temporarily down. Please try again in a few minutes.")
-            
-            st.rerun()
-            
+            self._store_result(future.result(), st.session_state.get('last_model_used', 'Unknown'))
+        except CancelledError:
+            pass
+        except asyncio.TimeoutError:
+            self._queue_message("error", "⏱️ Request timed out after 10 minutes. Please try with a shorter text or different model.")
         except Exception as e:
-            # Handle unexpected errors
-            st.session_state.voice_cloner_processing = False
-            st.error(f"❌ An unexpected error occurred: {str(e)}")
-            st.info("💡 **Troubleshooting:** Please try again. If the problem persists, try with a different AI model or shorter text.")
-            
-            # Only show debug info in development/debug mode
-            if st.session_state.get('debug_mode', False):
-                import traceback
-                with st.expander("🔍 Technical Details (Debug Mode)"):
-                    st.code(traceback.format_exc())
-            
-            st.rerun()
+            self._handle_processing_error(e)
+        
+        # One full rerun re-enables the submit button and renders results/messages
+        st.rerun()
     
-    def _process_voice_cloning_sync(self, example1: str, example2: str, example3: str, new_piece: str, model: str):
-        """Process the voice cloning request using async wrapper for consistency."""
+    def _store_result(self, result, model: str) -> None:
+        """Store a finished result, audit-log it and queue the success message."""
+        # The download name is fixed once so it is stable across reruns
+        st.session_state.voice_cloner_result = result
+        st.session_state.voice_cloner_result_filename = f"reformatted_text_{datetime.now():%Y%m%d_%H%M%S}.txt"
+        
+        # Log the activity
         try:
-            # Create input model
-            input_data = VoiceClonerInput(
-                writing_example_1=example1,
-                writing_example_2=example2,
-                writing_example_3=example3,
-                new_piece_to_create=new_piece,
-                model=model,
-                username=self.get_current_user(),
-                session_id=st.session_state.get('session_id', 'default')
+            get_audit_logger(
+                user=self.get_current_user(),
+                role=st.session_state.get('role', 'N/A'),
+                action="VOICE_CLONER_REQUEST",
+                details=f"Model: {model}, Confidence: {result.confidence_score}%, Iterations: {result.iterations_completed}, Time: {result.processing_time:.1f}s"
             )
-            
-            # Process using the sync wrapper that calls async method consistently
-            result = self.controller.process_voice_cloning_sync(input_data)
-            
-            # Store result
-            st.session_state.voice_cloner_result = result
-            st.session_state.voice_cloner_processing = False
-            
-            # Log the activity
-            try:
-                from src.audit_logger import get_audit_logger
-                get_audit_logger(
-                    user=self.get_current_user(),
-                    role=st.session_state.get('role', 'N/A'),
-                    action="VOICE_CLONER_REQUEST",
-                    details=f"Model: {model}, Confidence: {result.confidence_score}%, Iterations: {result.iterations_completed}, Time: {result.processing_time:.1f}s"
-                )
-            except Exception as log_error:
-                # Don't fail the whole process if logging fails
-                print(f"Warning: Failed to log activity: {log_error}")
-            
-            st.success("✅ Text reformatting completed successfully!")
-            st.rerun()
-            
-        except ValueError as ve:
-            # Handle user-friendly validation errors
-            st.session_state.voice_cloner_processing = False
-            st.error(f"❌ {str(ve)}")
-            
-            # Provide helpful suggestions based on error type
-            error_msg = str(ve).lower()
-            if "too short" in error_msg:
-                st.info("💡 **Tip:** Try providing longer writing examples (at least 20 characters each) and text to reformat (at least 10 characters).")
-            elif "too long" in error_msg:
-                st.info("💡 **Tip:** Try shortening your text. Consider breaking very long texts into smaller sections.")
-            elif "empty" in error_msg:
-                st.info("💡 **Tip:** Make sure all writing examples and the text to reformat are filled in.")
-            elif "api key" in error_msg:
-                st.info("💡 **Tip:** Please contact the administrator - the AI service is not properly configured.")
-            elif "rate limit" in error_msg:
-                st.info("💡 **Tip:** Please wait a few minutes and try again. The AI service has temporary usage limits.")
-            elif "timeout" in error_msg:
-                st.info("💡 **Tip:** Try using a different AI model or shorter text. Some models may be slower than others.")
-            elif "unavailable" in error_msg:
-                st.info("💡 **Tip:** The AI service is temporarily down. Please try again in a few minutes.")
-            elif "event loop" in error_msg or "asyncio" in error_msg:
-                st.info("💡 **Tip:** There was an async processing issue. Please try again - this is usually temporary.")
-            
-            st.rerun()
-            
-        except Exception as e:
-            # Handle unexpected errors
-            st.session_state.voice_cloner_processing = False
-            st.error(f"❌ An unexpected error occurred: {str(e)}")
-            st.info("💡 **Troubleshooting:** Please try again. If the problem persists, try with a different AI model or shorter text.")
-            
-            # Only show debug info in development/debug mode
-            if st.session_state.get('debug_mode', False):
-                import traceback
+        except Exception as log_error:
+            # Don't fail the whole process if logging fails
+            print(f"Warning: Failed to log activity: {log_error}")
+        
+        self._queue_message("success", "✅ Text reformatting completed successfully!")
+    
+    def _queue_message(self, level: str, message: str) -> None:
+        """Queue a status message to show on the next full render."""
+        st.session_state.setdefault('voice_cloner_messages', []).append((level, message))
+    
+    def _show_queued_messages(self) -> None:
+        """Show and clear status messages queued by background job handling."""
+        for level, message in st.session_state.pop('voice_cloner_messages', []):
+            if level == "debug":
                 with st.expander("🔍 Technical Details (Debug Mode)"):
-                    st.code(traceback.format_exc())
-            
-            st.rerun()
+                    st.code(message)
+            else:
+                getattr(st, level)(message)
     
-    async def _display_results(self):
+    def _handle_processing_error(self, error: Exception):
+        """Queue a user-facing message for a failed voice cloning job."""
+        st.session_state.voice_cloner_processing = False
+        
+        if isinstance(error, ValueError):
+            # Handle user-friendly validation errors
+            self._queue_message("error", f"❌ {str(error)}")
+            
+            # Provide a helpful suggestion based on the error type
+            error_msg = str(error).lower()
+            for needle, tip in _ERROR_TIPS:
+                if needle in error_msg:
+                    self._queue_message("info", tip)
+                    break
+            return
+        
+        # Handle unexpected errors
+        self._queue_message("error", f"❌ An unexpected error occurred: {str(error)}")
+        self._queue_message("info", "💡 **Troubleshooting:** Please try again. If the problem persists, try with a different AI model or shorter text.")
+        
+        # Only show debug info in development/debug mode
+        if st.session_state.get('debug_mode', False):
+            self._queue_message("debug", "".join(traceback.format_exception(error)))
+    
+    def _display_results(self):
         """Display the voice cloning results with enhanced UX."""
         result = st.session_state.voice_cloner_result
         
         st.subheader("🎯 Reformatted Text Result")
+        if result.from_cache:
+            st.caption("♻️ Cached result - this exact request was processed earlier")
         
-        # Enhanced responsive metrics display
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            # Color-coded confidence score
-            confidence = result.confidence_score
-            if confidence >= 80:
-                st.metric("Confidence Score", f"{confidence}%", help="High confidence - excellent voice match")
-                st.success("🎯 Excellent Match")
-            elif confidence >= 60:
-                st.metric("Confidence Score", f"{confidence}%", help="Good confidence - solid voice match")
-                st.info("👍 Good Match")
-            else:
-                st.metric("Confidence Score", f"{confidence}%", help="Lower confidence - consider providing more diverse writing examples")
-                st.warning("⚠️ Fair Match")
-        
-        with col2:
-            st.metric("Iterations Completed", result.iterations_completed, help="Number of AI refinement cycles completed")
-            if result.iterations_completed >= 50:
-                st.success("🔄 Full Processing")
-            else:
-                st.info("⚡ Fast Processing")
-        
-        with col3:
-            processing_time = result.processing_time
-            st.metric("Processing Time", f"{processing_time:.1f}s", help="Total time taken for voice cloning")
-            if processing_time < 30:
-                st.success("⚡ Fast")
-            elif processing_time < 120:
-                st.info("⏱️ Normal")
-            else:
-                st.warning("🐌 Slow")
+        # Enhanced responsive metrics display: (label, value, help, (status level, badge))
+        metrics = (
+            ("Confidence Score", f"{result.confidence_score}%", *_confidence_badge(result.confidence_score)),
+            ("Iterations Completed", result.iterations_completed, "Number of AI refinement cycles completed",
+             ("success", "🔄 Full Processing") if result.iterations_completed >= 50 else ("info", "⚡ Fast Processing")),
+            ("Processing Time", f"{result.processing_time:.1f}s", "Total time taken for voice cloning",
+             _processing_time_badge(result.processing_time)),
+        )
+        for (label, value, help_text, (level, badge)), col in zip(metrics, st.columns(3)):
+            with col:
+                st.metric(label, value, help=help_text)
+                getattr(st, level)(badge)
         
         # Enhanced result display with copy functionality
         st.subheader("📄 Reformatted Text")
@@ -450,15 +532,10 @@ class VoiceClonerPage(BasePage):
         word_count = len(result.final_piece.split())
         st.caption(f"📊 Result: {char_count:,} characters, {word_count:,} words")
         
-        # Scrollable text area for better UX with long results
-        st.text_area(
-            "Reformatted Text (click to select all):",
-            value=result.final_piece,
-            height=300,
-            key="result_text_area",
-            help="Click in the text area and use Ctrl+A (Cmd+A on Mac) to select all text for easy copying",
-            label_visibility="collapsed"
-        )
+        # Read-only code block instead of a text area: no widget state copy of the
+        # text, and long results stay collapsed so they are not sent on every rerun
+        with st.expander(f"📄 View Reformatted Text ({char_count:,} chars)", expanded=char_count < 5000):
+            st.code(result.final_piece, language=None, wrap_lines=True)
         
         # Action buttons in responsive layout
         button_col1, button_col2, button_col3 = st.columns([2, 2, 1])
@@ -467,7 +544,7 @@ class VoiceClonerPage(BasePage):
             st.download_button(
                 label="📥 Download as Text File",
                 data=result.final_piece,
-                file_name=f"reformatted_text_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                file_name=st.session_state.get('voice_cloner_result_filename', "reformatted_text.txt"),
                 mime="text/plain",
                 help="Download the reformatted text as a .txt file",
                 use_container_width=True
@@ -476,7 +553,7 @@ class VoiceClonerPage(BasePage):
         with button_col2:
             # Copy to clipboard button (using JavaScript workaround)
             if st.button("📋 Copy to Clipboard", help="Copy the reformatted text to your clipboard", use_container_width=True):
-                st.info("💡 **Tip:** Click in the text area above and use Ctrl+A then Ctrl+C (Cmd+A then Cmd+C on Mac) to copy all text.")
+                st.info("💡 **Tip:** Open the reformatted text above and use the copy icon in its top-right corner to copy all text.")
         
         with button_col3:
             if st.button("🗑️ Clear", help="Clear results and start over", use_container_width=True):
@@ -497,7 +574,7 @@ class VoiceClonerPage(BasePage):
             - **Confidence Score:** {result.confidence_score}% (based on style consistency analysis)
             - **Processing Time:** {result.processing_time:.1f} seconds
             - **Refinement Iterations:** {result.iterations_completed} cycles
-            - **Processing Method:** {'Chunked' if st.session_state.get('last_input_length', 0) > 5000 else 'Standard'}
+            - **Processing Method:** {f"Chunked ({st.session_state.get('last_batch_size', 'Unknown')} chunks in parallel)" if st.session_state.get('last_input_length', 0) > 5000 else 'Standard'}
             """)
         
         # Feedback section for continuous improvement
@@ -518,5 +595,13 @@ class VoiceClonerPage(BasePage):
             )
             
             if st.button("📤 Submit Feedback"):
-                # In a real implementation, this would send feedback to analytics
+                # Record off the script thread so a slow sink never blocks the UI
+                _FEEDBACK_POOL.submit(
+                    _post_feedback,
+                    satisfaction,
+                    feedback_text,
+                    self.get_current_user(),
+                    st.session_state.get('role', 'N/A'),
+                    st.session_state.get('last_model_used', 'N/A')
+                )
                 st.success("✅ Thank you for your feedback! This helps us improve the voice cloning system.")
\ No newline at end of file
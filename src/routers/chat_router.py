@@ -1,22 +1,248 @@
 from fastapi import APIRouter, HTTPException, Body
-from typing import Dict, Optional, List
+from fastapi.responses import JSONResponse, ORJSONResponse
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple
+import asyncio
+import logging
+import os
+import threading
+import time
+
+import redis
+import redis.asyncio as redis_async
+
+try:
+    import orjson  # noqa: F401 – optional, required by ORJSONResponse
+    _FastJSONResponse = ORJSONResponse
+except ImportError:
+    _FastJSONResponse = JSONResponse
 
 from src.models.chat_models import ChatMessageInput, ChatMessageOutput, ChatSession, ChatHistoryItem, UserHistoryEntry
 from src.services.user_history_service import user_history_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/chat",
     tags=["Chat"],
 )
 
-# In-memory store for chat sessions for now. 
-# In a production scenario, this would be a database (e.g., Redis, PostgreSQL).
-chat_sessions: Dict[str, ChatSession] = {}
+CHAT_SESSION_MAX = int(os.getenv("CHAT_SESSION_MAX", 10000))
+CHAT_SESSION_TTL_SECONDS = int(os.getenv("CHAT_SESSION_TTL_SECONDS", 24 * 3600))
+
+
+class SessionCache:
+    """Bounded LRU mapping of session_id -> ChatSession with an idle TTL.
+
+    Sessions untouched for ``ttl`` seconds expire, and once ``maxsize`` is
+    reached the least recently used session is evicted, so the store no
+    longer grows with every session ever opened.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, ChatSession]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        # Entries are kept in access order, so expired ones sit at the front
+        while self._data:
+            key, (ts, _) = next(iter(self._data.items()))
+            if now - ts < self.ttl:
+                break
+            del self._data[key]
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._data.get(session_id)
+            if entry is None:
+                return None
+            self._data[session_id] = (now, entry[1])
+            self._data.move_to_end(session_id)
+            return entry[1]
+
+    def __contains__(self, session_id: object) -> bool:
+        return isinstance(session_id, str) and self.get(session_id) is not None
+
+    def __getitem__(self, session_id: str) -> ChatSession:
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def __setitem__(self, session_id: str, session: ChatSession) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._data[session_id] = (now, session)
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._data)
+
+
+# Per-process cache of chat sessions.  When REDIS_URL is set, Redis is the
+# shared store (so any worker can serve any session) and this is only an L1.
+chat_sessions = SessionCache(maxsize=CHAT_SESSION_MAX, ttl=CHAT_SESSION_TTL_SECONDS)
+
+_redis_url = os.getenv("REDIS_URL")
+session_store = redis_async.from_url(_redis_url, decode_responses=True) if _redis_url else None
+
+
+def _session_key(session_id: str) -> str:
+    return f"chat:session:{session_id}"
+
+
+def _history_key(session_id: str) -> str:
+    return f"chat:session:{session_id}:history"
+
+
+async def _load_shared_session(session_id: str) -> Optional[ChatSession]:
+    """Load a session (metadata hash + history list) from Redis in one round trip."""
+    if session_store is None:
+        return None
+    try:
+        async with session_store.pipeline(transaction=False) as pipe:
+            pipe.hgetall(_session_key(session_id))
+            pipe.lrange(_history_key(session_id), 0, -1)
+            meta, items = await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Redis session lookup failed for {session_id}: {e}")
+        return None
+    if not meta:
+        return None
+
+    session = ChatSession(**meta, history=[ChatHistoryItem.model_validate_json(item) for item in items])
+    chat_sessions[session_id] = session
+    return session
+
+
+async def _load_session(session_id: str) -> Optional[ChatSession]:
+    """Return a session from the local cache, falling back to Redis."""
+    return chat_sessions.get(session_id) or await _load_shared_session(session_id)
 
-def get_or_create_session(report_id: str, username: str, session_id: Optional[str] = None) -> ChatSession:
+
+async def _save_shared_session(session: ChatSession) -> None:
+    if session_store is None:
+        return
+    key = _session_key(session.session_id)
+    try:
+        async with session_store.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                "session_id": session.session_id,
+                "report_id": session.report_id,
+                "username": session.username,
+                "created_at": session.created_at.isoformat(),
+            })
+            pipe.expire(key, CHAT_SESSION_TTL_SECONDS)
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Redis session save failed for {session.session_id}: {e}")
+
+
+async def _append_shared_history(session_id: str, items: List[ChatHistoryItem]) -> None:
+    """Append messages and refresh both keys' TTL in a single round trip."""
+    if session_store is None:
+        return
+    try:
+        async with session_store.pipeline(transaction=False) as pipe:
+            pipe.rpush(_history_key(session_id), *(item.model_dump_json() for item in items))
+            pipe.expire(_history_key(session_id), CHAT_SESSION_TTL_SECONDS)
+            pipe.expire(_session_key(session_id), CHAT_SESSION_TTL_SECONDS)
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Redis history append failed for {session_id}: {e}")
+
+
+# User-history entries are queued and written by one background task in
+# batches, so each batch is a single append to the history file and that I/O
+# stays off the request path.
+HISTORY_BATCH_SIZE = 50
+HISTORY_BATCH_WINDOW_SECONDS = 0.5
+
+# Queued entries are Optional: None tells the writer to flush and exit
+_history_queue: Optional["asyncio.Queue[Optional[UserHistoryEntry]]"] = None
+_history_writer: Optional["asyncio.Task[None]"] = None
+
+
+async def _write_history_batch(batch: List[UserHistoryEntry]) -> None:
+    try:
+        await asyncio.to_thread(user_history_service.add_activities, batch)
+    except Exception as e:
+        logger.error(f"Failed to write {len(batch)} user history entries: {e}")
+
+
+async def _drain_history_queue(queue: "asyncio.Queue[Optional[UserHistoryEntry]]") -> None:
+    """Single writer: collect entries for up to the batch window, then append them at once."""
+    loop = asyncio.get_running_loop()
+    stop = False
+    while not stop:
+        entry = await queue.get()
+        stop = entry is None
+        batch = [] if stop else [entry]
+        deadline = loop.time() + HISTORY_BATCH_WINDOW_SECONDS
+        while not stop and len(batch) < HISTORY_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if entry is None:
+                stop = True
+            else:
+                batch.append(entry)
+
+        if batch:
+            await _write_history_batch(batch)
+
+
+async def flush_history_queue() -> None:
+    """Write every queued history entry and stop the writer (run on shutdown)."""
+    global _history_queue, _history_writer
+    queue, writer = _history_queue, _history_writer
+    _history_queue = _history_writer = None
+    if queue is None:
+        return
+    if writer is not None and not writer.done():
+        # The writer flushes its current batch and everything queued before this
+        queue.put_nowait(None)
+        await writer
+    # Anything left behind by a writer that had already died
+    leftover = []
+    while not queue.empty():
+        entry = queue.get_nowait()
+        if entry is not None:
+            leftover.append(entry)
+    if leftover:
+        await _write_history_batch(leftover)
+
+
+# Included routers' shutdown handlers run when the application stops or reloads
+router.add_event_handler("shutdown", flush_history_queue)
+
+
+def _queue_history(entry: UserHistoryEntry) -> None:
+    """Hand a history entry to the batching writer, starting it on first use."""
+    global _history_queue, _history_writer
+    if _history_queue is None or _history_writer is None or _history_writer.done():
+        _history_queue = asyncio.Queue()
+        _history_writer = asyncio.create_task(_drain_history_queue(_history_queue))
+    _history_queue.put_nowait(entry)
+
+
+async def get_or_create_session(report_id: str, username: str, session_id: Optional[str] = None) -> ChatSession:
     """Retrieves an existing chat session or creates a new one."""
-    if session_id and session_id in chat_sessions:
-        session = chat_sessions[session_id]
+    session = await _load_session(session_id) if session_id else None
+    if session is not None:
         if session.report_id == report_id and session.username == username:
             return session
         else:
@@ -26,9 +252,10 @@ def get_or_create_session(report_id: str, username: str, session_id: Optional[st
     # Create a new session if no valid session_id is provided or found
     new_session = ChatSession(report_id=report_id, username=username)
     chat_sessions[new_session.session_id] = new_session
+    await _save_shared_session(new_session)
     
     # Log session creation
-    user_history_service.log_session_created(username, new_session.session_id, report_id)
+    _queue_history(user_history_service.session_created_entry(username, new_session.session_id, report_id))
     
     return new_session
 
@@ -41,14 +268,15 @@ async def ask_question(
     and returns the AI's response.
     Manages chat session history and logs user activities.
     """
-    session = get_or_create_session(
+    session = await get_or_create_session(
         report_id=payload.report_id, 
         username=payload.username,
         session_id=payload.session_id
     )
 
     # Add user message to history
-    session.history.append(ChatHistoryItem(role="user", content=payload.user_query))
+    user_item = ChatHistoryItem(role="user", content=payload.user_query)
+    session.history.append(user_item)
 
     # --- AI Logic Placeholder --- 
     # For Task 3 (Echo AI), this will be simple. For Task 6, this will involve LLM call.
@@ -57,19 +285,21 @@ async def ask_question(
     # --- End AI Logic Placeholder ---
 
     # Add AI response to history
-    session.history.append(ChatHistoryItem(role="ai", content=ai_response_content))
+    ai_item = ChatHistoryItem(role="ai", content=ai_response_content)
+    session.history.append(ai_item)
 
     # Update the session in our in-memory store (important if ChatSession is mutable and copied by value)
     chat_sessions[session.session_id] = session
+    await _append_shared_history(session.session_id, [user_item, ai_item])
 
-    # Log the chat message activity
-    user_history_service.log_chat_message(
+    # Log the chat message activity (written asynchronously in batches)
+    _queue_history(user_history_service.chat_message_entry(
         username=payload.username,
         session_id=session.session_id,
         report_id=payload.report_id,
         query=payload.user_query,
         response=ai_response_content
-    )
+    ))
 
     return ChatMessageOutput(
         ai_response=ai_response_content,
@@ -80,21 +310,25 @@ async def ask_question(
 @router.get("/{session_id}/history", response_model=ChatSession)
 async def get_chat_history(session_id: str):
     """Retrieves the chat history for a given session ID."""
-    if session_id not in chat_sessions:
+    # Another worker may have appended to this session, so prefer the shared copy
+    session = await _load_shared_session(session_id) or chat_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Chat session not found.")
-    return chat_sessions[session_id]
+    return session
 
 @router.get("/users/{username}/history")
 async def get_user_history(username: str, hours: int = 48):
     """Retrieves the user's activity history for the last N hours (default 48)."""
     try:
         history = user_history_service.get_user_history(username, hours)
-        return {
+        # Returned as a response object so FastAPI does not run its own
+        # jsonable_encoder pass over every activity before serializing
+        return _FastJSONResponse({
             "username": username,
             "hours": hours,
             "total_activities": len(history),
-            "activities": [entry.model_dump() for entry in history]
-        }
+            "activities": [entry.model_dump(mode="json") for entry in history]
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving user history: {str(e)}")
 
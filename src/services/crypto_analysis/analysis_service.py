@@ -1,48 +1,167 @@
 import asyncio
 import logging
-from typing import Dict, Any, List
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+import math
+import time
+import weakref
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 from datetime import datetime, timedelta
 
-from src.services.mcp.coingecko_client import CoinGeckoMCPClient
+try:
+    import bottleneck as bn
+except ImportError:  # optional, only speeds up the rolling means
+    bn = None
+
+from src.services.mcp.coingecko_client import CoinGeckoMCPClient, get_coingecko_client
 from src.services.mcp.models import HistoricalData, HistoricalPrice
 
 logger = logging.getLogger(__name__)
 
+# Look-back offsets (in data points) for the performance_Nd metrics; kept
+# ascending so the offsets with enough history are always a prefix
+_PERFORMANCE_OFFSETS = np.array([7, 14, 30])
+_PERFORMANCE_KEYS = ('performance_7d', 'performance_14d', 'performance_30d')
+
+# Insight ladders: bisect_right over the bucket edges picks the message.  The
+# ladders compare strictly (``> 70``, ``< 30``), so upper edges are nudged up
+# one ulp to keep the boundary values in the middle bucket.  None = no insight.
+_TREND_EDGES = (-2.0, math.nextafter(2.0, math.inf))
+_TREND_MESSAGES = (
+    "📉 Price is {a:.1f}% below 7-day average - bearish trend",
+    "🔄 Price is trading near 7-day average - sideways movement",
+    "📈 Price is {v:.1f}% above 7-day average - strong upward momentum",
+)
+_RSI_EDGES = (30.0, math.nextafter(70.0, math.inf))
+_RSI_MESSAGES = (
+    "💡 RSI at {v:.1f} suggests oversold conditions - potential buying opportunity",
+    "✅ RSI at {v:.1f} shows balanced momentum",
+    "⚠️ RSI at {v:.1f} indicates overbought conditions - potential correction ahead",
+)
+_VOLATILITY_EDGES = (2.0, math.nextafter(5.0, math.inf))
+_VOLATILITY_MESSAGES = (
+    "😴 Low volatility ({v:.1f}%) - price is consolidating",
+    "📊 Moderate volatility ({v:.1f}%) - normal price movement",
+    "🌊 High volatility ({v:.1f}%) - expect significant price swings",
+)
+_PERFORMANCE_EDGES = (-10.0, -5.0, math.nextafter(5.0, math.inf), math.nextafter(10.0, math.inf))
+_PERFORMANCE_MESSAGES = (
+    "⚠️ Significant 7-day decline: {v:.1f}%",
+    "📉 Weak 7-day performance: {v:.1f}%",
+    None,
+    "📈 Strong 7-day performance: +{v:.1f}%",
+    "🚀 Exceptional 7-day performance: +{v:.1f}%",
+)
+_POSITION_EDGES = (0.2, math.nextafter(0.8, math.inf))
+_POSITION_MESSAGES = (
+    "🔻 Price near 30-day low (${low:,.2f}) - testing support",
+    None,
+    "🔝 Price near 30-day high (${high:,.2f}) - testing resistance",
+)
+
+# Repeated analyses of the same coin/period within this window reuse the last
+# result instead of re-fetching history and rebuilding the charts.  Shared by
+# all instances, since callers typically create a service per request.
+# Keyed by (coin_id, days, include_charts).
+ANALYSIS_CACHE_TTL_SECONDS = 60
+_analysis_cache: Dict[Tuple[str, int, bool], Tuple[float, Dict[str, Any]]] = {}
+# Per-event-loop [lock, waiters] entries so concurrent misses for one key fetch only once
+_analysis_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int, bool], List[Any]]]" = weakref.WeakKeyDictionary()
+
 class AnalysisService:
     """Provide common technical analysis metrics using historical price data."""
 
-    def __init__(self):
-        self.client = CoinGeckoMCPClient()
-        self.connected = False
+    def __init__(self, client: Optional[CoinGeckoMCPClient] = None):
+        # Defaults to the shared client so the connection is set up once per process
+        self.client = client or get_coingecko_client()
+        self.connected = self.client.is_connected
 
     async def _ensure_connection(self):
-        if not self.connected:
-            self.connected = await self.client.connect()
+        if not self.client.is_connected:
+            await self.client.connect()
+        self.connected = self.client.is_connected
+
+    async def analyze(self, coin_id: str, days: int = 30, include_charts: bool = True) -> Dict[str, Any]:
+        """Return comprehensive analysis with charts, metrics, and insights.
+
+        Pass ``include_charts=False`` when only ``metrics``/``insights`` are
+        needed; the Plotly figures are then not built (``charts`` is empty
+        unless a cached full analysis is returned).
+        """
+        key = (coin_id, days, include_charts)
+        cached = self._cached_analysis(key)
+        if cached is None and not include_charts:
+            # A full analysis has the same metrics and insights
+            cached = self._cached_analysis((coin_id, days, True))
+        if cached is not None:
+            return self._copy_result(cached)
+
+        # Each entry is [lock, callers using it]; it is dropped once the last
+        # caller is done so the table only holds keys currently in flight.
+        locks = _analysis_locks.setdefault(asyncio.get_running_loop(), {})
+        entry = locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                # Another caller may have filled the cache while we waited
+                cached = self._cached_analysis(key)
+                if cached is not None:
+                    return self._copy_result(cached)
+                result = await self._analyze_uncached(coin_id, days, include_charts)
+
+                now = time.monotonic()
+                for stale in [k for k, (ts, _) in _analysis_cache.items() if now - ts >= ANALYSIS_CACHE_TTL_SECONDS]:
+                    _analysis_cache.pop(stale, None)
+                _analysis_cache[key] = (now, result)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                locks.pop(key, None)
+        return self._copy_result(result)
 
-    async def analyze(self, coin_id: str, days: int = 30) -> Dict[str, Any]:
-        """Return comprehensive analysis with charts, metrics, and insights."""
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a cached analysis that callers may modify.
+
+        The top level and the ``metrics``/``charts``/``insights`` containers
+        are copied; the Plotly figures themselves are shared.
+        """
+        copy = dict(result)
+        for name in ("metrics", "charts"):
+            if isinstance(copy.get(name), dict):
+                copy[name] = dict(copy[name])
+        if isinstance(copy.get("insights"), list):
+            copy["insights"] = list(copy["insights"])
+        return copy
+
+    @staticmethod
+    def _cached_analysis(key: Tuple[str, int, bool]) -> Optional[Dict[str, Any]]:
+        entry = _analysis_cache.get(key)
+        if entry and time.monotonic() - entry[0] < ANALYSIS_CACHE_TTL_SECONDS:
+            return entry[1]
+        return None
+
+    async def _analyze_uncached(self, coin_id: str, days: int, include_charts: bool = True) -> Dict[str, Any]:
         await self._ensure_connection()
         hist: HistoricalData = await self.client.get_historical_data(coin_id, days)
 
-        # Build pandas DataFrame
-        df = pd.DataFrame([
-            {
-                'timestamp': p.timestamp,
-                'price': p.price
-            } for p in hist.prices
-        ])
-        
-        prices = df['price']
-        timestamps = df['timestamp']
+        # Plain arrays are all the indicators need; Plotly takes them as-is.
+        # The client's parser already provides them alongside the point list.
+        prices = hist.prices_arr
+        if prices is None:
+            prices = np.fromiter((p.price for p in hist.prices), dtype=np.float64, count=len(hist.prices))
+        timestamps = hist.timestamps_arr
+        if timestamps is None:
+            timestamps = np.array([p.timestamp for p in hist.prices], dtype='datetime64[us]')
+
+        # RSI series is shared by the metrics (last value) and the RSI chart
+        rsi_series = self._rsi_series(prices)
 
         # Calculate technical indicators
-        metrics = self._calculate_technical_indicators(prices)
+        metrics = self._calculate_technical_indicators(prices, rsi_series=rsi_series)
         
         # Generate charts
-        charts = self._generate_charts(df, coin_id, metrics)
+        charts = self._generate_charts(timestamps, prices, coin_id, metrics, rsi_series=rsi_series) if include_charts else {}
         
         # Generate insights
         insights = self._generate_insights(metrics, prices)
@@ -51,22 +170,59 @@ class AnalysisService:
             'metrics': metrics,
             'charts': charts,
             'insights': insights,
-            'data_points': len(hist.prices),
-            'date_range': f"{timestamps.iloc[0].strftime('%Y-%m-%d')} to {timestamps.iloc[-1].strftime('%Y-%m-%d')}"
+            'data_points': len(prices),
+            'date_range': f"{np.datetime_as_string(timestamps[0], unit='D')} to {np.datetime_as_string(timestamps[-1], unit='D')}"
         }
     
-    def _calculate_technical_indicators(self, prices: pd.Series) -> Dict[str, Any]:
+    @staticmethod
+    def _prefix_sums(values: np.ndarray) -> np.ndarray:
+        """Return ``C`` with ``C[i] = sum(values[:i])``, for O(1) window sums."""
+        return np.cumsum(np.insert(values, 0, 0.0))
+
+    @classmethod
+    def _rolling_mean(cls, values: np.ndarray, window: int, csum: Optional[np.ndarray] = None) -> np.ndarray:
+        """Trailing mean over *window* values, NaN until the window is full (like ``rolling().mean()``).
+
+        Uses ``bottleneck.move_mean`` when installed; otherwise pass *csum*
+        (from :meth:`_prefix_sums`) to reuse one cumulative sum for several
+        windows over the same values.
+        """
+        if bn is not None and 0 < window <= len(values):
+            return bn.move_mean(values, window=window, min_count=window)
+        out = np.full(len(values), np.nan)
+        if 0 < window <= len(values):
+            if csum is None:
+                csum = cls._prefix_sums(values)
+            out[window - 1:] = (csum[window:] - csum[:-window]) / window
+        return out
+
+    @classmethod
+    def _rsi_series(cls, prices: np.ndarray, period: int = 14) -> np.ndarray:
+        """Return the RSI series (simple moving average of gains/losses), aligned with *prices*."""
+        delta = np.diff(prices)
+        # 100 - 100 / (1 + up / down) == 100 * up / (up + down), and up + down
+        # is the mean absolute change: two rolling passes, one division
+        roll_up = cls._rolling_mean(np.maximum(delta, 0), period)
+        roll_abs = cls._rolling_mean(np.abs(delta), period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 * roll_up / roll_abs
+        # The first price has no change, so the series starts one step later
+        return np.concatenate(([np.nan], rsi)) if len(prices) else rsi
+
+    def _calculate_technical_indicators(self, prices: np.ndarray, rsi_series: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Calculate various technical analysis indicators."""
         metrics = {}
         
         try:
-            # Moving Averages
-            metrics['sma_7'] = prices.rolling(window=7).mean().iloc[-1]
-            metrics['sma_14'] = prices.rolling(window=14).mean().iloc[-1]
-            metrics['sma_30'] = prices.rolling(window=min(30, len(prices))).mean().iloc[-1]
+            # Moving Averages – only the latest value is needed, so average
+            # the trailing window instead of building a full rolling series
+            metrics['sma_7'] = self._tail_mean(prices, 7)
+            metrics['sma_14'] = self._tail_mean(prices, 14)
+            metrics['sma_30'] = self._tail_mean(prices, min(30, len(prices)))
             
-            # Current price vs moving averages
-            current_price = prices.iloc[-1]
+            # Current price vs moving averages – read the last point once as a
+            # Python float so the metric arithmetic below stays off numpy scalars
+            current_price = float(prices[-1])
             metrics['price_vs_sma_7'] = ((current_price - metrics['sma_7']) / metrics['sma_7']) * 100
             metrics['price_vs_sma_14'] = ((current_price - metrics['sma_14']) / metrics['sma_14']) * 100
             
@@ -75,13 +231,9 @@ class AnalysisService:
 
         try:
             # RSI (Relative Strength Index)
-            delta = prices.diff()
-            up, down = delta.clip(lower=0), -delta.clip(upper=0)
-            roll_up = up.rolling(14).mean()
-            roll_down = down.rolling(14).mean()
-            rs = roll_up / roll_down
-            rsi = 100 - (100 / (1 + rs))
-            metrics['rsi_14'] = rsi.iloc[-1]
+            if rsi_series is None:
+                rsi_series = self._rsi_series(prices)
+            metrics['rsi_14'] = float(rsi_series[-1])
             
             # RSI interpretation
             if metrics['rsi_14'] > 70:
@@ -95,100 +247,117 @@ class AnalysisService:
             logger.warning(f"RSI calc error: {e}")
 
         try:
-            # Volatility
-            metrics['volatility_14'] = prices.pct_change().rolling(14).std().iloc[-1] * 100
+            # Volatility – sample std of the last 14 daily returns
+            if len(prices) >= 15:
+                tail = prices[-15:]
+                returns = np.diff(tail) / tail[:-1]
+                metrics['volatility_14'] = float(returns.std(ddof=1) * 100)
+            else:
+                metrics['volatility_14'] = float('nan')
             
-            # Price performance
-            metrics['performance_7d'] = ((prices.iloc[-1] - prices.iloc[-7]) / prices.iloc[-7]) * 100 if len(prices) >= 7 else None
-            metrics['performance_14d'] = ((prices.iloc[-1] - prices.iloc[-14]) / prices.iloc[-14]) * 100 if len(prices) >= 14 else None
-            metrics['performance_30d'] = ((prices.iloc[-1] - prices.iloc[-30]) / prices.iloc[-30]) * 100 if len(prices) >= 30 else None
+            # Price performance – gather every past price with enough history
+            # in one indexing op; windows without enough data stay None
+            valid = _PERFORMANCE_OFFSETS <= len(prices)
+            past = prices[-_PERFORMANCE_OFFSETS[valid]]
+            perf = (current_price - past) / past * 100
+            metrics.update(dict.fromkeys(_PERFORMANCE_KEYS))
+            for key, value in zip(_PERFORMANCE_KEYS, perf):
+                metrics[key] = float(value)
             
             # Support and Resistance (simple)
-            metrics['price_min_30d'] = prices.tail(min(30, len(prices))).min()
-            metrics['price_max_30d'] = prices.tail(min(30, len(prices))).max()
+            last_30 = prices[-min(30, len(prices)):]
+            metrics['price_min_30d'] = float(last_30.min())
+            metrics['price_max_30d'] = float(last_30.max())
             
         except Exception as e:
             logger.warning(f"Performance calc error: {e}")
 
         return metrics
     
-    def _generate_charts(self, df: pd.DataFrame, coin_id: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _tail_mean(prices: np.ndarray, window: int) -> float:
+        """Mean of the last *window* prices; NaN if there are fewer (as ``rolling`` would give)."""
+        if len(prices) < window:
+            return float('nan')
+        return float(prices[-window:].mean())
+    
+    def _generate_charts(self, timestamps: np.ndarray, prices: np.ndarray, coin_id: str,
+                         metrics: Dict[str, Any], rsi_series: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Generate interactive charts for the analysis."""
+        # Imported on first use: plotly is slow to load and metrics-only
+        # callers (include_charts=False) never need it
+        import plotly.graph_objects as go
+
         charts = {}
         
         try:
-            # Price chart with moving averages
-            fig_price = go.Figure()
-            
-            # Add price line
-            fig_price.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=df['price'],
+            # Price chart with moving averages – traces are collected first and
+            # the figure is built (and validated) once
+            traces = [go.Scatter(
+                x=timestamps,
+                y=prices,
                 name='Price',
                 line=dict(color='#00d4aa', width=2)
-            ))
+            )]
             
-            # Add moving averages if available
-            if 'sma_7' in metrics and len(df) >= 7:
-                sma_7 = df['price'].rolling(window=7).mean()
-                fig_price.add_trace(go.Scatter(
-                    x=df['timestamp'],
-                    y=sma_7,
+            # Add moving averages if available; without bottleneck both lines
+            # share one cumulative sum
+            price_sums = self._prefix_sums(prices) if bn is None else None
+            if 'sma_7' in metrics and len(prices) >= 7:
+                traces.append(go.Scatter(
+                    x=timestamps,
+                    y=self._rolling_mean(prices, 7, price_sums),
                     name='SMA 7',
                     line=dict(color='#ff6b6b', width=1, dash='dash')
                 ))
             
-            if 'sma_14' in metrics and len(df) >= 14:
-                sma_14 = df['price'].rolling(window=14).mean()
-                fig_price.add_trace(go.Scatter(
-                    x=df['timestamp'],
-                    y=sma_14,
+            if 'sma_14' in metrics and len(prices) >= 14:
+                traces.append(go.Scatter(
+                    x=timestamps,
+                    y=self._rolling_mean(prices, 14, price_sums),
                     name='SMA 14',
                     line=dict(color='#4ecdc4', width=1, dash='dot')
                 ))
             
-            fig_price.update_layout(
-                title=f'{coin_id.title()} Price Analysis',
-                xaxis_title='Date',
-                yaxis_title='Price (USD)',
-                template='plotly_dark',
-                height=400
+            fig_price = go.Figure(
+                data=traces,
+                layout=go.Layout(
+                    title=f'{coin_id.title()} Price Analysis',
+                    xaxis_title='Date',
+                    yaxis_title='Price (USD)',
+                    template='plotly_dark',
+                    height=400
+                )
             )
             
             charts['price_chart'] = fig_price
             
             # RSI Chart
             if 'rsi_14' in metrics:
-                rsi_values = []
-                prices = df['price']
-                delta = prices.diff()
-                up, down = delta.clip(lower=0), -delta.clip(upper=0)
-                roll_up = up.rolling(14).mean()
-                roll_down = down.rolling(14).mean()
-                rs = roll_up / roll_down
-                rsi_series = 100 - (100 / (1 + rs))
+                if rsi_series is None:
+                    rsi_series = self._rsi_series(prices)
                 
-                fig_rsi = go.Figure()
-                fig_rsi.add_trace(go.Scatter(
-                    x=df['timestamp'][14:],  # Skip first 14 days for RSI
-                    y=rsi_series[14:],
-                    name='RSI (14)',
-                    line=dict(color='#feca57')
-                ))
+                fig_rsi = go.Figure(
+                    data=[go.Scatter(
+                        x=timestamps[14:],  # Skip first 14 days for RSI
+                        y=rsi_series[14:],
+                        name='RSI (14)',
+                        line=dict(color='#feca57')
+                    )],
+                    layout=go.Layout(
+                        title='RSI (Relative Strength Index)',
+                        xaxis_title='Date',
+                        yaxis_title='RSI',
+                        template='plotly_dark',
+                        height=300,
+                        yaxis=dict(range=[0, 100])
+                    )
+                )
                 
                 # Add overbought/oversold lines
                 fig_rsi.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought (70)")
                 fig_rsi.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold (30)")
                 
-                fig_rsi.update_layout(
-                    title='RSI (Relative Strength Index)',
-                    xaxis_title='Date',
-                    yaxis_title='RSI',
-                    template='plotly_dark',
-                    height=300,
-                    yaxis=dict(range=[0, 100])
-                )
-                
                 charts['rsi_chart'] = fig_rsi
             
         except Exception as e:
@@ -197,66 +366,49 @@ class AnalysisService:
         
         return charts
     
-    def _generate_insights(self, metrics: Dict[str, Any], prices: pd.Series) -> List[str]:
+    def _generate_insights(self, metrics: Dict[str, Any], prices: np.ndarray) -> List[str]:
         """Generate actionable insights based on analysis."""
         insights = []
         
         try:
-            current_price = prices.iloc[-1]
+            current_price = float(prices[-1])
             
             # Price trend insights
             if 'price_vs_sma_7' in metrics:
-                if metrics['price_vs_sma_7'] > 2:
-                    insights.append(f"📈 Price is {metrics['price_vs_sma_7']:.1f}% above 7-day average - strong upward momentum")
-                elif metrics['price_vs_sma_7'] < -2:
-                    insights.append(f"📉 Price is {abs(metrics['price_vs_sma_7']):.1f}% below 7-day average - bearish trend")
-                else:
-                    insights.append("🔄 Price is trading near 7-day average - sideways movement")
+                self._add_insight(insights, metrics['price_vs_sma_7'], _TREND_EDGES, _TREND_MESSAGES)
             
             # RSI insights
             if 'rsi_14' in metrics:
-                rsi = metrics['rsi_14']
-                if rsi > 70:
-                    insights.append(f"⚠️ RSI at {rsi:.1f} indicates overbought conditions - potential correction ahead")
-                elif rsi < 30:
-                    insights.append(f"💡 RSI at {rsi:.1f} suggests oversold conditions - potential buying opportunity")
-                else:
-                    insights.append(f"✅ RSI at {rsi:.1f} shows balanced momentum")
+                self._add_insight(insights, metrics['rsi_14'], _RSI_EDGES, _RSI_MESSAGES)
             
             # Volatility insights
             if 'volatility_14' in metrics:
-                vol = metrics['volatility_14']
-                if vol > 5:
-                    insights.append(f"🌊 High volatility ({vol:.1f}%) - expect significant price swings")
-                elif vol < 2:
-                    insights.append(f"😴 Low volatility ({vol:.1f}%) - price is consolidating")
-                else:
-                    insights.append(f"📊 Moderate volatility ({vol:.1f}%) - normal price movement")
+                self._add_insight(insights, metrics['volatility_14'], _VOLATILITY_EDGES, _VOLATILITY_MESSAGES)
             
             # Performance insights
             if 'performance_7d' in metrics and metrics['performance_7d'] is not None:
-                perf_7d = metrics['performance_7d']
-                if perf_7d > 10:
-                    insights.append(f"🚀 Exceptional 7-day performance: +{perf_7d:.1f}%")
-                elif perf_7d > 5:
-                    insights.append(f"📈 Strong 7-day performance: +{perf_7d:.1f}%")
-                elif perf_7d < -10:
-                    insights.append(f"⚠️ Significant 7-day decline: {perf_7d:.1f}%")
-                elif perf_7d < -5:
-                    insights.append(f"📉 Weak 7-day performance: {perf_7d:.1f}%")
+                self._add_insight(insights, metrics['performance_7d'], _PERFORMANCE_EDGES, _PERFORMANCE_MESSAGES)
             
             # Support/Resistance insights
             if 'price_min_30d' in metrics and 'price_max_30d' in metrics:
-                price_range = metrics['price_max_30d'] - metrics['price_min_30d']
-                current_position = (current_price - metrics['price_min_30d']) / price_range
-                
-                if current_position > 0.8:
-                    insights.append(f"🔝 Price near 30-day high (${metrics['price_max_30d']:,.2f}) - testing resistance")
-                elif current_position < 0.2:
-                    insights.append(f"🔻 Price near 30-day low (${metrics['price_min_30d']:,.2f}) - testing support")
+                low, high = metrics['price_min_30d'], metrics['price_max_30d']
+                price_range = high - low
+                if price_range > 0:
+                    current_position = (current_price - low) / price_range
+                    self._add_insight(insights, current_position, _POSITION_EDGES, _POSITION_MESSAGES,
+                                      low=low, high=high)
                 
         except Exception as e:
             logger.error(f"Insights generation error: {e}")
             insights.append("⚠️ Unable to generate full insights due to limited data")
         
-        return insights 
\ No newline at end of file
+        return insights
+
+    @staticmethod
+    def _add_insight(insights: List[str], value: float, edges: Tuple[float, ...],
+                     messages: Tuple[Optional[str], ...], **fields: Any) -> None:
+        """Append the message for *value*'s bucket; NaN lands in the middle (neutral) bucket."""
+        index = bisect_right(edges, value) if value == value else len(edges) // 2
+        message = messages[index]
+        if message is not None:
+            insights.append(message.format(v=value, a=abs(value), **fields)) 
\ No newline at end of file
@@ -1,8 +1,8 @@
 import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from src.services.mcp.coingecko_client import CoinGeckoMCPClient
+from src.services.mcp.coingecko_client import CoinGeckoMCPClient, get_coingecko_client
 from src.services.mcp.models import PriceData, ComparisonData, CoinData
 
 logger = logging.getLogger(__name__)
@@ -10,41 +10,45 @@ logger = logging.getLogger(__name__)
 class ComparisonService:
     """Service to compare multiple cryptocurrencies using the MCP/REST client."""
 
-    def __init__(self):
-        self.client = CoinGeckoMCPClient()
-        self.connected = False
+    def __init__(self, client: Optional[CoinGeckoMCPClient] = None):
+        # Defaults to the shared client so the connection is set up once per process
+        self.client = client or get_coingecko_client()
+        self.connected = self.client.is_connected
 
     async def _ensure_connection(self):
-        if not self.connected:
-            self.connected = await self.client.connect()
+        if not self.client.is_connected:
+            await self.client.connect()
+        self.connected = self.client.is_connected
 
     async def compare(self, coin_ids: List[str]) -> Dict[str, Any]:
         """Compare multiple coins and return metrics suitable for UI table."""
         await self._ensure_connection()
 
-        # Fetch price data for each coin
+        # Fetch price data for all coins concurrently
+        results = await asyncio.gather(
+            *(self.client.get_coin_price(cid) for cid in coin_ids),
+            return_exceptions=True,
+        )
         prices: Dict[str, PriceData] = {}
-        for cid in coin_ids:
-            try:
-                prices[cid] = await self.client.get_coin_price(cid)
-            except Exception as e:
-                logger.warning(f"Failed to fetch price for {cid}: {e}")
-
-        # Build metrics
-        rows = []
-        metrics = [
-            ("Price", lambda p: f"${p.current_price:,.2f}"),
-            ("24h Change", lambda p: f"{p.price_change_percentage_24h:+.2f}%" if p.price_change_percentage_24h is not None else "N/A"),
-            ("Market Cap", lambda p: f"${p.market_cap:,.0f}" if p.market_cap else "N/A"),
-            ("24h Volume", lambda p: f"${p.volume_24h:,.0f}" if p.volume_24h else "N/A"),
-        ]
-
-        comparison_metrics = []
-        for metric_name, fn in metrics:
-            row = {"metric": metric_name}
-            for cid, pdata in prices.items():
-                row[cid] = fn(pdata)
-            comparison_metrics.append(row)
+        for cid, result in zip(coin_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to fetch price for {cid}: {result}")
+            else:
+                prices[cid] = result
+
+        # Build metrics: one row per metric, one column per coin
+        price_row = {"metric": "Price"}
+        change_row = {"metric": "24h Change"}
+        market_cap_row = {"metric": "Market Cap"}
+        volume_row = {"metric": "24h Volume"}
+        for cid, p in prices.items():
+            change, market_cap, volume = p.price_change_percentage_24h, p.market_cap, p.volume_24h
+            price_row[cid] = f"${p.current_price:,.2f}"
+            change_row[cid] = f"{change:+.2f}%" if change is not None else "N/A"
+            market_cap_row[cid] = f"${market_cap:,.0f}" if market_cap else "N/A"
+            volume_row[cid] = f"${volume:,.0f}" if volume else "N/A"
+
+        comparison_metrics = [price_row, change_row, market_cap_row, volume_row]
 
         return {
             "coins": list(prices.keys()),
@@ -5,13 +5,15 @@ This package contains services for integrating with MCP servers,
 specifically for cryptocurrency data via CoinGecko MCP server.
 """
 
-from .config import MCPConfig
-from .coingecko_client import CoinGeckoMCPClient
+from .config import MCPConfig, get_default_config
+from .coingecko_client import CoinGeckoMCPClient, get_coingecko_client
 from .exceptions import MCPConnectionError, MCPTimeoutError, MCPRateLimitError
 
 __all__ = [
     'MCPConfig',
+    'get_default_config',
     'CoinGeckoMCPClient', 
+    'get_coingecko_client',
     'MCPConnectionError',
     'MCPTimeoutError',
     'MCPRateLimitError'
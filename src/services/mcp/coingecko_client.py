@@ -9,14 +9,17 @@ import json
 import logging
 import subprocess
 import time
+import weakref
+from functools import lru_cache
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 import aiohttp
+import numpy as np
 import requests
 import unicodedata
 import xml.etree.ElementTree as ET
 
-from .config import MCPConfig
+from .config import MCPConfig, get_default_config
 from .models import (
     Tool, PriceData, CoinData, MarketData, SearchResult, 
     HistoricalData, HistoricalPrice, MCPResponse, TimeFrame
@@ -41,14 +44,17 @@ class CoinGeckoMCPClient:
         Initialize the MCP client.
         
         Args:
-            config: MCP configuration instance
+            config: MCP configuration instance; defaults to the shared
+                instance from :func:`get_default_config`
         """
-        self.config = config or MCPConfig()
+        self.config = config or get_default_config()
         self.mcp_process: Optional[subprocess.Popen] = None
         self.is_connected = False
         self.available_tools: List[Tool] = []
         self.last_health_check = 0
         self.session: Optional[aiohttp.ClientSession] = None
+        # Per-event-loop locks so concurrent connect() calls start one process
+        self._connect_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
         
         # Rate limiting
         self.last_request_time = 0
@@ -59,31 +65,38 @@ class CoinGeckoMCPClient:
         """
         Connect to CoinGecko MCP server.
         
+        Safe to call concurrently: callers wait for an attempt already in
+        progress and return early once the client is connected.
+        
         Returns:
             True if connected successfully, False otherwise
         """
-        try:
-            logger.info("Attempting to connect to CoinGecko MCP server...")
-            
-            # First try MCP connection
-            if await self._connect_mcp():
-                self.is_connected = True
-                logger.info("✅ Successfully connected to CoinGecko MCP server")
+        lock = self._connect_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+        async with lock:
+            if self.is_connected:
                 return True
+            try:
+                logger.info("Attempting to connect to CoinGecko MCP server...")
             
-            # Fallback to REST API validation
-            logger.warning("MCP connection failed, validating REST API fallback...")
-            if await self._validate_rest_api():
-                self.is_connected = True
-                logger.info("✅ REST API fallback validated and ready")
-                return True
+                # First try MCP connection
+                if await self._connect_mcp():
+                    self.is_connected = True
+                    logger.info("✅ Successfully connected to CoinGecko MCP server")
+                    return True
             
-            logger.error("❌ Both MCP and REST API connections failed")
-            return False
+                # Fallback to REST API validation
+                logger.warning("MCP connection failed, validating REST API fallback...")
+                if await self._validate_rest_api():
+                    self.is_connected = True
+                    logger.info("✅ REST API fallback validated and ready")
+                    return True
             
-        except Exception as e:
-            logger.error(f"Connection error: {e}")
-            return False
+                logger.error("❌ Both MCP and REST API connections failed")
+                return False
+            
+            except Exception as e:
+                logger.error(f"Connection error: {e}")
+                return False
     
     async def _connect_mcp(self) -> bool:
         """Attempt to connect to MCP server using mcp-remote."""
@@ -199,7 +212,12 @@ class CoinGeckoMCPClient:
             return []
     
     async def disconnect(self) -> None:
-        """Disconnect from MCP server."""
+        """Disconnect from MCP server.
+
+        Only the owner of the client should call this.  The shared instance
+        from :func:`get_coingecko_client` is used by every crypto service, so
+        it must not be disconnected by an individual service.
+        """
         if self.mcp_process:
             try:
                 self.mcp_process.terminate()
@@ -1039,14 +1057,20 @@ class CoinGeckoMCPClient:
         """Parse historical data from response."""
         try:
             from datetime import datetime
-            prices = [HistoricalPrice(timestamp=datetime.fromtimestamp(p[0]/1000), price=p[1]) for p in data.get('prices', [])]
+            raw_prices = data.get('prices', [])
+            prices = [HistoricalPrice(timestamp=datetime.fromtimestamp(p[0]/1000), price=p[1]) for p in raw_prices]
+            # Price column in one conversion for numeric consumers; the timestamp
+            # column is built from the points so both use the same local time
+            price_pairs = np.asarray(raw_prices, dtype=np.float64).reshape(-1, 2)
             market_caps = [HistoricalPrice(timestamp=datetime.fromtimestamp(m[0]/1000), price=m[1]) for m in data.get('market_caps', [])]
             volumes = [HistoricalPrice(timestamp=datetime.fromtimestamp(v[0]/1000), price=v[1]) for v in data.get('total_volumes', [])]
             return HistoricalData(
                 coin_id=coin_id,
                 prices=prices,
                 market_caps=market_caps,
-                total_volumes=volumes
+                total_volumes=volumes,
+                timestamps_arr=np.array([p.timestamp for p in prices], dtype='datetime64[ms]'),
+                prices_arr=price_pairs[:, 1]
             )
         except Exception as e:
             logger.error(f"Error parsing historical data: {e}")
@@ -1191,4 +1215,16 @@ class CoinGeckoMCPClient:
             "thorchain": "thorchain", "rune": "thorchain",
             "raydium": "raydium", "ray": "raydium",
             "serum": "serum", "srm": "serum"
-        } 
\ No newline at end of file
+        }
+
+
+@lru_cache(maxsize=1)
+def get_coingecko_client() -> CoinGeckoMCPClient:
+    """Return the process-wide CoinGeckoMCPClient.
+
+    The crypto services share it so the MCP process (or REST fallback check)
+    is set up once rather than once per service instance.  Services only
+    ever ``connect()`` it; none of them may ``disconnect()`` it, since that
+    would drop the connection for every other service.
+    """
+    return CoinGeckoMCPClient()
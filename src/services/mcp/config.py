@@ -6,15 +6,26 @@ Handles loading and validation of MCP server configurations.
 
 import json
 import os
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import ClassVar, Dict, Any, Optional, Tuple
 from pathlib import Path
 import logging
 
+try:
+    import orjson
+except ImportError:  # optional, only speeds up parsing
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 class MCPConfig:
     """MCP Configuration manager for loading and validating MCP server settings."""
     
+    # Parsed config files keyed by (path, mtime); every client builds its own
+    # MCPConfig, so unchanged files are parsed once per process.  The parsed
+    # dicts are shared between instances and treated as read-only.
+    _parse_cache: ClassVar[Dict[Tuple[str, int], Dict[str, Any]]] = {}
+    
     def __init__(self, config_path: Optional[str] = None):
         """
         Initialize MCP configuration.
@@ -60,8 +71,7 @@ class MCPConfig:
                 self._create_default_config()
                 return
             
-            with open(self.config_path, 'r') as f:
-                self._config = json.load(f)
+            self._config = self._parse_config_file(self.config_path)
             
             self._validate_config()
             logger.info(f"MCP configuration loaded from {self.config_path}")
@@ -71,6 +81,20 @@ class MCPConfig:
             logger.info("Falling back to default configuration...")
             self._create_default_config()
     
+    @classmethod
+    def _parse_config_file(cls, path: Path) -> Dict[str, Any]:
+        """Parse *path*, reusing the previous parse if the file is unchanged."""
+        key = (str(path.resolve()), path.stat().st_mtime_ns)
+        config = cls._parse_cache.get(key)
+        if config is None:
+            data = path.read_bytes()
+            config = orjson.loads(data) if orjson is not None else json.loads(data)
+            # Drop parses of older versions of the same file
+            for stale in [k for k in cls._parse_cache if k[0] == key[0]]:
+                del cls._parse_cache[stale]
+            cls._parse_cache[key] = config
+        return config
+    
     def _create_default_config(self) -> None:
         """Create a default configuration if none exists."""
         self._config = {
@@ -190,4 +214,14 @@ class MCPConfig:
     
     def reload_config(self) -> None:
         """Reload configuration from file."""
-        self.load_config() 
\ No newline at end of file
+        self.load_config()
+
+
+@lru_cache(maxsize=1)
+def get_default_config() -> MCPConfig:
+    """Return the process-wide MCPConfig for the default config location.
+
+    Clients that aren't given an explicit config share this instance instead
+    of probing the candidate paths and loading the file each time.
+    """
+    return MCPConfig()
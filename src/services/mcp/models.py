@@ -1,25 +1,30 @@
 """
 Data Models for MCP Responses and Crypto Data
 
-Defines Pydantic models for type-safe data handling.
+Defines lightweight dataclass models for crypto data handling.
 """
 
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
-# Since we can't install pydantic yet, I'll use dataclasses for now
-# TODO: Replace with Pydantic models when dependencies are available
+import numpy as np
 
-@dataclass
+# Plain (slotted) dataclasses rather than Pydantic models: the client builds
+# these from already-parsed responses whose values don't always match the
+# annotations (e.g. epoch ints for datetimes, missing counts), so validating
+# models would reject data that is used today, and construction here is cheaper
+# than validation.
+
+@dataclass(slots=True)
 class Tool:
     """Represents an MCP tool/function."""
     name: str
     description: str
     input_schema: Dict[str, Any]
 
-@dataclass  
+@dataclass(slots=True)  
 class PriceData:
     """Cryptocurrency price information."""
     coin_id: str
@@ -63,7 +68,7 @@ class PriceData:
         if self.volume_24h and not self.total_volume:
             self.total_volume = self.volume_24h
 
-@dataclass
+@dataclass(slots=True)
 class CoinData:
     """Comprehensive coin information."""
     id: str
@@ -89,7 +94,7 @@ class CoinData:
     atl: Optional[float] = None
     atl_date: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """Global market overview data."""
     total_market_cap: Dict[str, float]
@@ -117,7 +122,7 @@ class MarketData:
         if self.market_cap_percentage and 'btc' in self.market_cap_percentage:
             self.btc_dominance = self.market_cap_percentage['btc']
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Search result for coin lookup."""
     id: str
@@ -127,7 +132,7 @@ class SearchResult:
     thumb: Optional[str] = None
     large: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class HistoricalPrice:
     """Historical price point."""
     timestamp: datetime
@@ -135,13 +140,17 @@ class HistoricalPrice:
     market_cap: Optional[float] = None
     volume: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class HistoricalData:
     """Historical data collection."""
     coin_id: str
     prices: List[HistoricalPrice]
     market_caps: List[HistoricalPrice]
     total_volumes: List[HistoricalPrice]
+    # Column arrays parallel to ``prices``, filled at parse time so numeric
+    # consumers don't unpack the per-point objects again (naive local time, same as ``prices``)
+    timestamps_arr: Optional[np.ndarray] = field(default=None, repr=False)
+    prices_arr: Optional[np.ndarray] = field(default=None, repr=False)
 
 class TimeFrame(Enum):
     """Supported time frames for historical data."""
@@ -153,14 +162,14 @@ class TimeFrame(Enum):
     YEAR_1 = "1y"
     MAX = "max"
 
-@dataclass
+@dataclass(slots=True)
 class ComparisonData:
     """Data for comparing multiple coins."""
     coins: List[CoinData]
     comparison_matrix: Dict[str, Dict[str, float]]
     correlation_data: Optional[Dict[str, Dict[str, float]]] = None
 
-@dataclass
+@dataclass(slots=True)
 class MCPResponse:
     """Standard MCP response wrapper."""
     success: bool
@@ -168,7 +177,7 @@ class MCPResponse:
     error: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
-@dataclass
+@dataclass(slots=True)
 class ChatContext:
     """Context for chat conversations."""
     user_id: str
@@ -177,7 +186,7 @@ class ChatContext:
     current_coins: List[str]
     analysis_preferences: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisQuery:
     """Query for crypto analysis."""
     query_type: str
@@ -185,7 +194,7 @@ class AnalysisQuery:
     timeframe: TimeFrame
     parameters: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of crypto analysis."""
     query: AnalysisQuery
@@ -194,7 +203,7 @@ class AnalysisResult:
     recommendations: List[str]
     visualizations: List[Dict[str, Any]]
 
-@dataclass
+@dataclass(slots=True)
 class PlotData:
     """Data for creating visualizations."""
     plot_type: str
@@ -1,91 +1,243 @@
 import json
+import logging
 import os
+import threading
+import time
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from src.models.chat_models import UserHistoryEntry, ChatSession
 from src.config import LOGS_DIR
 
+try:
+    import orjson
+except ImportError:  # optional, only speeds up (de)serialization
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value):
+    """Serialize datetimes as ISO strings (as orjson does) and anything else via str()."""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _json_line(entry: Dict) -> bytes:
+    """Encode *entry* as one newline-terminated JSONL record."""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry, default=_json_default) + '\n').encode()
+
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 class UserHistoryService:
-    """Service for managing user history with JSON file storage."""
+    """Service for managing user history with append-only JSONL file storage."""
+    
+    # get_user_history prunes expired entries at most this often
+    CLEANUP_INTERVAL_SECONDS = 600
     
     def __init__(self):
-        self.history_file = LOGS_DIR / "user_history.json"
+        self.history_file = LOGS_DIR / "user_history.jsonl"
+        # Pre-JSONL store (a single JSON array), migrated on startup
+        self.legacy_history_file = LOGS_DIR / "user_history.json"
+        # Writes may come from FastAPI background threads; serialize the
+        # file updates so concurrent entries are not lost.
+        self._write_lock = threading.RLock()
+        # In-memory copy of the file plus how far into it has been read; other
+        # processes append to the same file, so new lines are picked up from
+        # that offset, and a rewrite (new inode or shorter file) reloads it.
+        self._entries: List[Dict] = []
+        # Parsed entry timestamps, aligned with _entries (None if unparseable)
+        self._timestamps: List[Optional[datetime]] = []
+        # Entries with a valid timestamp split per username, kept sorted by
+        # timestamp so time windows can be found with bisect
+        self._user_entries: Dict[str, List[Dict]] = {}
+        self._user_timestamps: Dict[str, List[datetime]] = {}
+        self._offset = 0
+        self._file_id = None
+        self._last_cleanup = 0.0
         self.ensure_file_exists()
     
     def ensure_file_exists(self):
-        """Ensure the history file exists."""
+        """Ensure the history file exists, converting a legacy JSON history."""
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
-        if not self.history_file.exists():
-            with open(self.history_file, 'w') as f:
-                json.dump([], f)
+        with self._write_lock:
+            if self.history_file.exists():
+                return
+            history = []
+            migrated = False
+            if self.legacy_history_file.exists():
+                try:
+                    history = _json_loads(self.legacy_history_file.read_bytes())
+                    if not isinstance(history, list):
+                        raise ValueError(f"expected a JSON array, got {type(history).__name__}")
+                    migrated = True
+                except (ValueError, OSError) as e:
+                    history = []
+                    logger.warning(f"Could not migrate legacy history {self.legacy_history_file}: {e}")
+            self.save_history(history)
+            if migrated:
+                self.legacy_history_file.unlink()
+            elif self.legacy_history_file.exists():
+                # Keep the unreadable history for manual recovery
+                backup = self.legacy_history_file.with_suffix('.json.bak')
+                try:
+                    self.legacy_history_file.replace(backup)
+                    logger.warning(f"Kept unmigrated legacy history as {backup}")
+                except OSError as e:
+                    logger.warning(f"Could not move legacy history to {backup}: {e}")
     
-    def load_history(self) -> List[Dict]:
-        """Load all history from the JSON file."""
+    def _refresh(self):
+        """Bring the in-memory entries up to date with the file (caller holds the lock)."""
+        try:
+            stat = self.history_file.stat()
+        except FileNotFoundError:
+            self._reset(None)
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            self._reset(file_id)
+        if stat.st_size == self._offset:
+            return
+        with open(self.history_file, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Leave a trailing partial line (a concurrent append) for the next read
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = _json_loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._add_entry(entry, self._parse_timestamp(entry))
+        self._offset += complete
+    
+    def _reset(self, file_id):
+        """Drop the in-memory entries (caller holds the lock)."""
+        self._entries, self._timestamps = [], []
+        self._user_entries, self._user_timestamps = {}, {}
+        self._offset, self._file_id = 0, file_id
+    
+    def _add_entry(self, entry: Dict, entry_time: Optional[datetime]):
+        """Add a loaded entry to the in-memory lists and the per-user index."""
+        self._entries.append(entry)
+        self._timestamps.append(entry_time)
+        if entry_time is None:
+            return
+        username = entry.get('username')
+        if username not in self._user_entries:
+            self._user_entries[username] = []
+            self._user_timestamps[username] = []
+        user_entries = self._user_entries[username]
+        user_timestamps = self._user_timestamps[username]
+        if not user_timestamps or entry_time >= user_timestamps[-1]:
+            user_entries.append(entry)
+            user_timestamps.append(entry_time)
+        else:
+            # Another process's batch landed slightly out of order
+            index = bisect_right(user_timestamps, entry_time)
+            user_entries.insert(index, entry)
+            user_timestamps.insert(index, entry_time)
+    
+    @staticmethod
+    def _parse_timestamp(entry: Dict) -> Optional[datetime]:
+        """Parse an entry's ISO timestamp once, when it is loaded."""
         try:
-            with open(self.history_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+            return datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
+        except (ValueError, KeyError):
+            return None
+    
+    def _snapshot(self) -> Tuple[List[Dict], List[Optional[datetime]]]:
+        """Return the current entries and their parsed timestamps."""
+        with self._write_lock:
+            self._refresh()
+            return self._entries, self._timestamps
+    
+    def load_history(self) -> List[Dict]:
+        """Return all history entries (cached; treat the list as read-only)."""
+        with self._write_lock:
+            self._refresh()
+            return self._entries
     
-    def save_history(self, history: List[Dict]):
-        """Save history to the JSON file."""
-        with open(self.history_file, 'w') as f:
-            json.dump(history, f, indent=2, default=str)
+    def save_history(self, history: List[Dict], timestamps: Optional[List[Optional[datetime]]] = None):
+        """Rewrite the history file with *history*, one JSON object per line."""
+        data = b''.join(_json_line(entry) for entry in history)
+        tmp_file = self.history_file.with_suffix('.jsonl.tmp')
+        with self._write_lock:
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            # Atomic swap so readers in other processes never see a partial file
+            os.replace(tmp_file, self.history_file)
+            stat = self.history_file.stat()
+            if timestamps is None:
+                timestamps = [self._parse_timestamp(entry) for entry in history]
+            self._reset((stat.st_dev, stat.st_ino))
+            for entry, entry_time in zip(history, timestamps):
+                self._add_entry(entry, entry_time)
+            self._offset = stat.st_size
     
     def add_activity(self, entry: UserHistoryEntry):
         """Add a new activity to the user history."""
-        history = self.load_history()
-        
-        # Convert to dict for JSON storage
-        entry_dict = entry.model_dump()
-        entry_dict['timestamp'] = entry.timestamp.isoformat()
+        self.add_activities([entry])
+    
+    def add_activities(self, entries: List[UserHistoryEntry]):
+        """Append several activities to the history file in a single write."""
+        # Timestamps are written as ISO strings by the encoder
+        data = b''.join(_json_line(entry.model_dump()) for entry in entries)
         
-        history.append(entry_dict)
-        self.save_history(history)
+        with self._write_lock:
+            with open(self.history_file, 'ab') as f:
+                f.write(data)
+            # Reads back our lines along with any appended by other processes
+            self._refresh()
     
     def cleanup_old_entries(self, hours: int = 48):
         """Remove entries older than specified hours."""
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        history = self.load_history()
+        with self._write_lock:
+            self._last_cleanup = time.monotonic()
+            history, timestamps = self._snapshot()
         
-        # Filter out old entries
-        filtered_history = []
-        for entry in history:
-            try:
-                entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-                if entry_time > cutoff_time:
-                    filtered_history.append(entry)
-            except (ValueError, KeyError):
+            # Filter out old entries
+            filtered_history = []
+            filtered_timestamps = []
+            for entry, entry_time in zip(history, timestamps):
                 # Keep entries with invalid timestamps for manual review
-                filtered_history.append(entry)
+                if entry_time is None or entry_time > cutoff_time:
+                    filtered_history.append(entry)
+                    filtered_timestamps.append(entry_time)
         
-        self.save_history(filtered_history)
+            # Only rewrite the file when something actually expired
+            if len(filtered_history) != len(history):
+                self.save_history(filtered_history, filtered_timestamps)
         return len(history) - len(filtered_history)  # Return number of cleaned entries
     
     def get_user_history(self, username: str, hours: int = 48) -> List[UserHistoryEntry]:
         """Get user history for the last N hours."""
-        # First cleanup old entries
-        self.cleanup_old_entries(hours)
+        # Prune old entries now and then; the window filter below is exact
+        if time.monotonic() - self._last_cleanup >= self.CLEANUP_INTERVAL_SECONDS:
+            self.cleanup_old_entries(hours)
         
-        history = self.load_history()
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        with self._write_lock:
+            self._refresh()
+            timestamps = self._user_timestamps.get(username, [])
+            # The per-user lists are sorted, so the window is a suffix
+            start = bisect_right(timestamps, cutoff_time)
+            history = self._user_entries.get(username, [])[start:]
+            timestamps = timestamps[start:]
         
-        user_entries = []
-        for entry in history:
-            if entry.get('username') == username:
-                try:
-                    entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-                    if entry_time > cutoff_time:
-                        # Convert back to UserHistoryEntry
-                        entry['timestamp'] = entry_time
-                        user_entries.append(UserHistoryEntry(**entry))
-                except (ValueError, KeyError):
-                    continue
-        
-        # Sort by timestamp (newest first)
-        user_entries.sort(key=lambda x: x.timestamp, reverse=True)
-        return user_entries
+        # Convert back to UserHistoryEntry (the cached dict stays as stored), newest first
+        return [
+            UserHistoryEntry(**{**entry, 'timestamp': entry_time})
+            for entry, entry_time in zip(reversed(history), reversed(timestamps))
+        ]
     
     def get_user_chat_sessions(self, username: str, hours: int = 48) -> List[Dict]:
         """Get user's chat sessions from history for the last N hours."""
@@ -121,10 +273,11 @@ class UserHistoryService:
         session_list.sort(key=lambda x: x['last_activity'], reverse=True)
         return session_list
     
-    def log_chat_message(self, username: str, session_id: str, report_id: str, 
-                        query: str, response: str):
-        """Convenience method to log a chat message activity."""
-        entry = UserHistoryEntry(
+    @staticmethod
+    def chat_message_entry(username: str, session_id: str, report_id: str,
+                           query: str, response: str) -> UserHistoryEntry:
+        """Build the history entry for a chat message activity."""
+        return UserHistoryEntry(
             username=username,
             activity_type='chat_message',
             session_id=session_id,
@@ -135,18 +288,26 @@ class UserHistoryService:
                 'query_length': len(query)
             }
         )
-        self.add_activity(entry)
     
-    def log_session_created(self, username: str, session_id: str, report_id: str):
-        """Convenience method to log session creation."""
-        entry = UserHistoryEntry(
+    @staticmethod
+    def session_created_entry(username: str, session_id: str, report_id: str) -> UserHistoryEntry:
+        """Build the history entry for a session creation."""
+        return UserHistoryEntry(
             username=username,
             activity_type='session_created',
             session_id=session_id,
             report_id=report_id,
             details={'action': 'new_session_created'}
         )
-        self.add_activity(entry)
+    
+    def log_chat_message(self, username: str, session_id: str, report_id: str, 
+                        query: str, response: str):
+        """Convenience method to log a chat message activity."""
+        self.add_activity(self.chat_message_entry(username, session_id, report_id, query, response))
+    
+    def log_session_created(self, username: str, session_id: str, report_id: str):
+        """Convenience method to log session creation."""
+        self.add_activity(self.session_created_entry(username, session_id, report_id))
 
 # Global instance
 user_history_service = UserHistoryService() 
\ No newline at end of file
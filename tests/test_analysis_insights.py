@@ -0,0 +1,83 @@
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("aiohttp")
+
+from src.services.crypto_analysis import analysis_service as svc
+from src.services.crypto_analysis.analysis_service import AnalysisService
+
+
+# The if/elif ladders the tables replaced; each returns the message index
+# (None = no insight), so the tables must pick the same bucket.
+def _trend(v):
+    return 2 if v > 2 else 0 if v < -2 else 1
+
+
+def _rsi(v):
+    return 2 if v > 70 else 0 if v < 30 else 1
+
+
+def _volatility(v):
+    return 2 if v > 5 else 0 if v < 2 else 1
+
+
+def _performance(v):
+    if v > 10:
+        return 4
+    if v > 5:
+        return 3
+    if v < -10:
+        return 0
+    if v < -5:
+        return 1
+    return None
+
+
+def _position(v):
+    return 2 if v > 0.8 else 0 if v < 0.2 else None
+
+
+def _around(*edges):
+    """Each edge plus its neighbouring floats."""
+    values = []
+    for edge in edges:
+        values += [math.nextafter(edge, -math.inf), edge, math.nextafter(edge, math.inf)]
+    return values
+
+
+CASES = [
+    (svc._TREND_EDGES, svc._TREND_MESSAGES, _trend, _around(-2.0, 2.0) + [-50.0, 0.0, 50.0]),
+    (svc._RSI_EDGES, svc._RSI_MESSAGES, _rsi, _around(30.0, 70.0) + [0.0, 50.0, 100.0]),
+    (svc._VOLATILITY_EDGES, svc._VOLATILITY_MESSAGES, _volatility, _around(2.0, 5.0) + [0.0, 3.0, 40.0]),
+    (svc._PERFORMANCE_EDGES, svc._PERFORMANCE_MESSAGES, _performance,
+     _around(-10.0, -5.0, 5.0, 10.0) + [-80.0, -7.0, 0.0, 7.0, 80.0]),
+    (svc._POSITION_EDGES, svc._POSITION_MESSAGES, _position, _around(0.2, 0.8) + [0.0, 0.5, 1.0]),
+]
+
+
+def _insights(value, edges, messages):
+    insights = []
+    AnalysisService._add_insight(insights, value, edges, messages, low=1.0, high=2.0)
+    return insights
+
+
+def _expected(value, messages, ladder):
+    index = ladder(value)
+    if index is None or messages[index] is None:
+        return []
+    return [messages[index].format(v=value, a=abs(value), low=1.0, high=2.0)]
+
+
+@pytest.mark.parametrize("edges, messages, ladder, values", CASES)
+def test_tables_match_ladders(edges, messages, ladder, values):
+    for value in values:
+        assert _insights(value, edges, messages) == _expected(value, messages, ladder), value
+
+
+@pytest.mark.parametrize("edges, messages, ladder, values", CASES)
+def test_nan_matches_ladders(edges, messages, ladder, values):
+    # NaN fails every comparison, so the ladders fell through to the neutral branch
+    nan = float("nan")
+    assert _insights(nan, edges, messages) == _expected(nan, messages, ladder)
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("notion_client")
+pytest.importorskip("tenacity")
+
+from src.notion_research import _llm_cache_key
+
+SYSTEM = "You are a research analyst."
+PROMPT = "# Project\n\n| Field | Answer |\n| --- | --- |\n| Team | Doxxed |\n\n- token\n- chain"
+
+
+def test_cosmetic_whitespace_keeps_the_key():
+    edited = "\n  # Project   \n\n\n\n| Field | Answer |  \n| --- | --- |\n| Team | Doxxed |\t\n\n- token\n- chain\n\n"
+    assert _llm_cache_key(SYSTEM, edited, "m") == _llm_cache_key(SYSTEM, PROMPT, "m")
+
+
+def test_newline_only_change_changes_the_key():
+    # Joining two table rows (or a heading and a paragraph) changes the Markdown
+    joined = PROMPT.replace("| --- | --- |\n| Team", "| --- | --- | | Team")
+    assert joined.split() == PROMPT.split()
+    assert _llm_cache_key(SYSTEM, joined, "m") != _llm_cache_key(SYSTEM, PROMPT, "m")
+
+    heading = PROMPT.replace("# Project\n\n", "# Project ")
+    assert _llm_cache_key(SYSTEM, heading, "m") != _llm_cache_key(SYSTEM, PROMPT, "m")
+
+
+def test_model_changes_the_key():
+    assert _llm_cache_key(SYSTEM, PROMPT, "a") != _llm_cache_key(SYSTEM, PROMPT, "b")
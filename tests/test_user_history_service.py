@@ -0,0 +1,116 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.models.chat_models import UserHistoryEntry
+from src.services import user_history_service as uhs
+
+
+@pytest.fixture
+def history_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(uhs, "LOGS_DIR", tmp_path)
+    return tmp_path
+
+
+def _entry(username, hours_ago=0.0, **fields):
+    return UserHistoryEntry(
+        username=username,
+        activity_type=fields.pop("activity_type", "chat_message"),
+        timestamp=datetime.utcnow() - timedelta(hours=hours_ago),
+        **fields,
+    )
+
+
+def test_appends_from_another_instance_are_read_from_the_offset(history_dir):
+    writer = uhs.UserHistoryService()
+    reader = uhs.UserHistoryService()
+    writer.add_activity(_entry("alice", session_id="s1"))
+    assert [e.session_id for e in reader.get_user_history("alice")] == ["s1"]
+    assert reader._offset == reader.history_file.stat().st_size
+
+    writer.add_activity(_entry("alice", session_id="s2"))
+    assert [e.session_id for e in reader.get_user_history("alice")] == ["s2", "s1"]
+    # Only the new line was parsed; the earlier entry object is unchanged
+    assert len(reader.load_history()) == 2
+
+
+def test_partial_trailing_line_waits_for_the_rest(history_dir):
+    service = uhs.UserHistoryService()
+    service.add_activity(_entry("alice", session_id="s1"))
+    line = json.dumps(_entry("alice", session_id="s2").model_dump(mode="json")).encode() + b"\n"
+    with open(service.history_file, "ab") as f:
+        f.write(line[:10])
+    offset = service.history_file.stat().st_size - 10
+    assert len(service.load_history()) == 1
+    assert service._offset == offset
+
+    with open(service.history_file, "ab") as f:
+        f.write(line[10:])
+    assert [e.session_id for e in service.get_user_history("alice")] == ["s2", "s1"]
+
+
+def test_rewrite_by_another_instance_reloads_the_file(history_dir):
+    writer = uhs.UserHistoryService()
+    reader = uhs.UserHistoryService()
+    writer.add_activities([_entry("alice", session_id="s1"), _entry("bob", session_id="s2")])
+    assert len(reader.load_history()) == 2
+
+    # save_history swaps in a new file (new inode) that is also shorter
+    writer.save_history([writer.load_history()[1]])
+    assert [e["username"] for e in reader.load_history()] == ["bob"]
+    assert reader.get_user_history("alice") == []
+
+
+def test_out_of_order_entries_are_kept_sorted(history_dir):
+    service = uhs.UserHistoryService()
+    service.add_activities([
+        _entry("alice", hours_ago=1, session_id="newer"),
+        _entry("alice", hours_ago=3, session_id="oldest"),
+        _entry("alice", hours_ago=2, session_id="middle"),
+    ])
+    timestamps = service._user_timestamps["alice"]
+    assert timestamps == sorted(timestamps)
+    assert [e.session_id for e in service.get_user_history("alice")] == ["newer", "middle", "oldest"]
+
+
+def test_window_returns_only_recent_entries_newest_first(history_dir):
+    service = uhs.UserHistoryService()
+    service.add_activities([
+        _entry("alice", hours_ago=50, session_id="expired"),
+        _entry("alice", hours_ago=47, session_id="day2"),
+        _entry("bob", hours_ago=1, session_id="other"),
+        _entry("alice", hours_ago=0.5, session_id="recent"),
+    ])
+    assert [e.session_id for e in service.get_user_history("alice")] == ["recent", "day2"]
+    assert [e.session_id for e in service.get_user_history("alice", hours=1)] == ["recent"]
+    assert service.get_user_history("carol") == []
+
+
+def test_entries_without_timestamps_are_kept_but_not_returned(history_dir):
+    service = uhs.UserHistoryService()
+    with open(service.history_file, "ab") as f:
+        f.write(b'{"username": "alice", "activity_type": "chat_message"}\n')
+    service.add_activity(_entry("alice", session_id="s1"))
+    assert len(service.load_history()) == 2
+    assert [e.session_id for e in service.get_user_history("alice")] == ["s1"]
+    assert service.cleanup_old_entries() == 0
+
+
+def test_unreadable_legacy_history_is_kept_as_backup(history_dir):
+    (history_dir / "user_history.json").write_text('[{"username": "alice"')
+    service = uhs.UserHistoryService()
+    assert service.load_history() == []
+    assert not (history_dir / "user_history.json").exists()
+    assert (history_dir / "user_history.json.bak").exists()
+
+
+def test_legacy_history_is_migrated(history_dir):
+    entry = _entry("alice", session_id="s1").model_dump(mode="json")
+    (history_dir / "user_history.json").write_text(json.dumps([entry]))
+    service = uhs.UserHistoryService()
+    assert [e.session_id for e in service.get_user_history("alice")] == ["s1"]
+    assert not (history_dir / "user_history.json").exists()
+    assert not (history_dir / "user_history.json.bak").exists()
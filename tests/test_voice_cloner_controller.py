@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("aiohttp")
+
+from src.controllers.voice_cloner_controller import (
+    VoiceClonerController,
+    VoiceClonerInput,
+    VoiceClonerOutput,
+    VoiceResultCache,
+)
+
+
+def _input(text):
+    return VoiceClonerInput(
+        writing_example_1="First example of the writer's voice, long enough.",
+        writing_example_2="Second example of the writer's voice, long enough.",
+        writing_example_3="Third example of the writer's voice, long enough.",
+        new_piece_to_create=text,
+        model="test-model",
+        username="tester",
+    )
+
+
+@pytest.fixture
+def controller():
+    controller = VoiceClonerController()
+    controller.result_cache = VoiceResultCache(max_size=4, ttl_hours=1)
+    return controller
+
+
+def _stub_chunks(controller, monkeypatch, fail_on):
+    """Refine chunks normally except the ones containing *fail_on*, which fall back."""
+    async def process_voice_cloning(input_data, on_text=None):
+        if fail_on is not None and fail_on in input_data.new_piece_to_create:
+            return await controller._fallback_simple_reformat(input_data)
+        return VoiceClonerOutput(
+            final_piece=input_data.new_piece_to_create,
+            style_rules="rules",
+            confidence_score=90,
+            iterations_completed=1,
+            processing_time=0.0,
+        )
+    monkeypatch.setattr(controller, "process_voice_cloning", process_voice_cloning)
+
+
+# Three ~4000 character chunks, the last one marked
+LONG_TEXT = " ".join(["This is a plain sentence of the piece."] * 220 + ["A marked sentence ends it."])
+
+
+def test_chunk_fallback_is_not_cached(controller, monkeypatch):
+    _stub_chunks(controller, monkeypatch, fail_on="marked")
+    data = _input(LONG_TEXT)
+
+    result = asyncio.run(controller.process_with_streaming(data))
+
+    assert result.fallback_used
+    assert result.style_rules.startswith("Processed")
+    assert controller.result_cache.cache == {}
+
+
+def test_chunked_result_without_fallback_is_cached(controller, monkeypatch):
+    _stub_chunks(controller, monkeypatch, fail_on=None)
+    data = _input(LONG_TEXT)
+
+    result = asyncio.run(controller.process_with_streaming(data))
+    assert not result.fallback_used
+    assert len(controller.result_cache.cache) == 1
+
+    cached = asyncio.run(controller.process_with_streaming(data))
+    assert cached.from_cache
+    assert cached.final_piece == result.final_piece
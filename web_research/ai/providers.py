@@ -1,9 +1,11 @@
+import asyncio
 import os
+import weakref
 import typer
 import json
 from openai import AsyncOpenAI
 import tiktoken
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from rich.console import Console
 from dotenv import load_dotenv
 from .text_splitter import RecursiveCharacterTextSplitter
@@ -15,10 +17,29 @@ load_dotenv()
 class AIClientFactory:
     """Factory for creating AI clients for different providers."""
 
+    # One client per event loop and (api_key, base_url) so every request reuses
+    # the same pooled keep-alive connections instead of building a new HTTP
+    # client.  The pool is bound to the loop it first ran on, and each CLI
+    # command runs in its own asyncio.run loop, so clients are not shared
+    # across loops; they are dropped along with their loop.
+    _clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
     @classmethod
     def create_client(cls, api_key: str, base_url: str) -> AsyncOpenAI:
-        """Create an AsyncOpenAI-compatible client for the specified provider."""
-        return AsyncOpenAI(api_key=api_key, base_url=base_url)
+        """Return the AsyncOpenAI-compatible client for the specified provider.
+
+        Inside a running event loop the client is shared by that loop;
+        outside one a new client is returned.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return AsyncOpenAI(api_key=api_key, base_url=base_url)
+        clients = cls._clients.setdefault(loop, {})
+        client = clients.get((api_key, base_url))
+        if client is None:
+            client = clients[(api_key, base_url)] = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        return client
 
     @classmethod
     def get_client(
@@ -1,9 +1,19 @@
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 
 
 def system_prompt() -> str:
-    """Creates the system prompt with current timestamp."""
-    now = datetime.now().isoformat()
+    """Creates the system prompt with the current date.
+
+    Only the date (not the time) is embedded, so every call made on the same
+    day sends a byte-identical system prompt that providers can serve from
+    their prompt-prefix cache.
+    """
+    return _system_prompt_for(date.today().isoformat())
+
+
+@lru_cache(maxsize=1)
+def _system_prompt_for(now: str) -> str:
     return f"""You are a senior blockchain fund analyst with deep experience in web3 and institutional investing. Today is {now}. Follow these instructions when responding:
     - You may be asked to research subjects that are after your knowledge cutoff.
     - The user is a highly experienced analyst, no need to simplify concepts, be as detailed as possible and make sure your response is correct, objective and based on the latest information.